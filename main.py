@@ -26,12 +26,21 @@
 
 ### IMPORT ###
 
+import fcntl
 import gc
+import hashlib
+import io
 import json
+import math
 import os
 import logging
 import signal
-from datetime import datetime
+import socket
+import sqlite3
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
 from types import NoneType
 
 import sys
@@ -86,6 +95,72 @@ WAIT_QUOTA     = 5 * 60  # Quota exhausted — wait longer to avoid hammering
 WAIT_FORBIDDEN = 2 * 60  # 403 / access denied — slightly more conservative
 WAIT_AUTH      = 5 * 60  # Gigya credential issues — avoid triggering rate-limits
 
+# Live event stream (GET /events)
+EVENT_QUEUE_SIZE      = 64  # Pending events per subscriber before it is dropped
+SSE_KEEPALIVE         = 15  # Seconds between keep-alive comments on an idle stream
+SSE_WRITE_TIMEOUT     = 10  # Seconds a single write may block before dropping the client
+HTTP_SHUTDOWN_TIMEOUT = 5   # Seconds the HVAC listener waits for open requests on cleanup
+
+# Profiling / event-loop health (overridable in the config's "profiling" section)
+LOOP_LAG_INTERVAL       = 1.0         # Seconds between event-loop lag probes
+LOOP_LAG_WARN_MS        = 100         # Lag above this is logged as a warning
+LOOP_LAG_CRITICAL_MS    = 1000        # Lag above this is logged as an error
+PROFILE_DIR_PATH        = './profiles'
+PROFILE_DEFAULT_SECONDS = 30          # Capture length for SIGUSR2 / POST /debug/profile
+PROFILE_MAX_SECONDS     = 5 * 60
+PROFILE_SAMPLE_INTERVAL = 0.005       # Seconds between stack samples
+
+# Bits of VehicleState.battery_percentage_checked
+BATTERY_CHECKED_WARN = 1
+BATTERY_CHECKED_MIN  = 2
+
+# Sample pipeline (create_vehicle() -> consumer stages)
+PIPELINE_QUEUE_SIZE           = 1024  # Items per stage queue (per worker in keyed stages)
+PIPELINE_NOTIFICATION_WORKERS = 4     # Concurrent NTFY sends (each vehicle stays in order)
+PIPELINE_REMEDIATION_WORKERS  = 1     # Concurrent charging_start / hvac_start calls
+
+# Action kinds returned by evaluate_battery_sample()
+ACTION_NOTIFY         = 'notify'
+ACTION_CHARGING_START = 'charging_start'
+ACTION_HVAC_START     = 'hvac_start'
+ACTION_ALERT          = 'alert'
+
+# NTFY notification templates: (title, message, emoji, priority).
+# Formatted with %(name)s -- vehicle nickname, %(value)s -- reading.
+NOTIFICATION_TEMPLATES = {
+    'battery_critical':  ("[%(name)s] NIVEL BATERIE CRITIC!",
+                          "Nivelul bateriei a '%(name)s' este critic - %(value)s%%",
+                          "red_square", "urgent"),
+    'battery_low':       ("[%(name)s] Nivel baterie scazut!",
+                          "Nivelul bateriei a '%(name)s' este scazut - %(value)s%%",
+                          "warning", "high"),
+    'charge_refused':    ("[%(name)s] EV REFUZA SA SE INCARCE!",
+                          "Vehiculul '%(name)s' refuza sa se incarce - %(value)s%%",
+                          "electric_plug", "min"),
+    'charged':           ("[%(name)s] EV s-a incarcat",
+                          "Vehiculul '%(name)s' este incarcat - %(value)s%%",
+                          "white_check_mark", "default"),
+    'battery_temp_high': ("[%(name)s] TEMPERATURA BATERIE RIDICATA!",
+                          "Vehiculul '%(name)s' are temperatura bateriei foarte mare - %(value)s deg",
+                          "stop_sign", "urgent"),
+    'hvac_low_battery':  ("[%(name)s] AC nu a pornit",
+                          "Vehiculul '%(name)s' nu are suficienta baterie (sub 30%%) "
+                          "ca sa poata porni AC - %(value)s%%",
+                          "battery", "default"),
+}
+
+# systemd integration (socket activation, readiness and watchdog)
+SD_LISTEN_FDS_START = 3       # First file descriptor passed by systemd
+SD_READY_TIMEOUT    = 2 * 60  # Report READY=1 after this long even if some vehicle never answered
+
+# Active/standby high availability (config's "high_availability" section)
+LEASE_TTL                = 15      # Seconds a leader lease stays valid without renewal
+LEASE_FENCE_MARGIN       = 0.2     # Fraction of the TTL a leader stops acting before its lease expires
+LEASE_KEEP_WARM_INTERVAL = WAIT_AUTH  # Seconds between token refreshes while standby
+
+GETOPT_SHORT_OPTIONS = "hvDc:p:U"
+GETOPT_LONG_OPTIONS  = ['help', 'version', 'debug', 'config=', 'port=', 'uvloop']
+
 
 ### HELPERS ###
 
@@ -100,6 +175,605 @@ async def cancel_tasks(tasks: list):
     gc.collect()  # Help reclaim memory from cancelled task closures promptly
 
 
+async def monitor_loop_lag(loop_stats, warn_ms=LOOP_LAG_WARN_MS,
+                           critical_ms=LOOP_LAG_CRITICAL_MS, interval=LOOP_LAG_INTERVAL):
+    """
+    Measure how late the event loop wakes up from a fixed sleep.
+
+    Anything that blocks the loop (file logging, JSON decoding, a long
+    synchronous section between two awaits) shows up as lag. Results are
+    kept in 'loop_stats' for GET /debug/loop and logged above thresholds.
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        lag_ms = max(0.0, (loop.time() - start - interval) * 1000)
+
+        loop_stats['samples'] += 1
+        loop_stats['last_ms']  = round(lag_ms, 3)
+        loop_stats['max_ms']   = max(loop_stats['max_ms'], loop_stats['last_ms'])
+        # Exponentially weighted moving average over roughly the last minute
+        loop_stats['avg_ms']   = round(loop_stats['avg_ms'] + (lag_ms - loop_stats['avg_ms']) / 60, 3)
+
+        if lag_ms >= critical_ms:
+            loop_stats['over_critical'] += 1
+            logging.error("[PROFILING] Event loop blocked for %.0f ms", lag_ms)
+        elif lag_ms >= warn_ms:
+            loop_stats['over_warn'] += 1
+            logging.warning("[PROFILING] Event loop lagging by %.0f ms", lag_ms)
+
+
+def format_task_dump():
+    """Return the name, coroutine and current stack of every live asyncio task."""
+    buf   = io.StringIO()
+    tasks = sorted(asyncio.all_tasks(), key=lambda task: task.get_name())
+    buf.write(f"{len(tasks)} live tasks\n")
+    for task in tasks:
+        buf.write(f"\n--- {task.get_name()}: {task.get_coro()!r}\n")
+        task.print_stack(file=buf)
+    return buf.getvalue()
+
+
+def sample_stacks(thread_id, seconds, output_path, interval=PROFILE_SAMPLE_INTERVAL):
+    """
+    Sample the stack of 'thread_id' for 'seconds' and write folded stacks.
+
+    Runs in a worker thread, so the event loop keeps running while it is
+    being observed. The output uses the "frame;frame;frame count" format
+    understood by flamegraph.pl and speedscope. Returns the sample count.
+    """
+    stacks   = Counter()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        frame = sys._current_frames().get(thread_id)
+        if frame is None:
+            break
+        stack = []
+        while frame is not None:
+            stack.append(f"{os.path.basename(frame.f_code.co_filename)}:{frame.f_code.co_name}")
+            frame = frame.f_back
+        stacks[';'.join(reversed(stack))] += 1
+        time.sleep(interval)
+
+    with open(output_path, 'w', encoding='utf-8') as output_file:
+        for stack, count in stacks.most_common():
+            output_file.write(f"{stack} {count}\n")
+    return sum(stacks.values())
+
+
+def start_profile_capture(profiling, seconds=PROFILE_DEFAULT_SECONDS):
+    """
+    Start a time-boxed sampling profile of the event loop thread.
+
+    Must be called from the event loop thread. Returns the output file
+    path, or None if a capture is already running.
+    """
+    if profiling['capture'] is not None and not profiling['capture'].done():
+        return None
+
+    seconds     = max(1, min(int(seconds), PROFILE_MAX_SECONDS))
+    os.makedirs(profiling['profile_dir'], exist_ok=True)
+    output_path = os.path.join(profiling['profile_dir'],
+                               f"profile-{datetime.today().strftime('%Y%m%d-%H%M%S')}.folded")
+
+    async def _capture():
+        logging.info("[PROFILING] Sampling for %ds into `%s'", seconds, output_path)
+        try:
+            samples = await asyncio.to_thread(sample_stacks, threading.get_ident(), seconds, output_path)
+        except Exception as e:
+            # Nobody awaits this task -- log here or the error is lost
+            logging.error("[PROFILING] Capture into `%s' failed: %s", output_path, e)
+            return
+        logging.info("[PROFILING] Wrote %d samples to `%s'", samples, output_path)
+
+    profiling['capture'] = asyncio.create_task(_capture())
+    return output_path
+
+
+def sd_listen_fds():
+    """
+    Return the listening sockets passed by systemd socket activation.
+
+    Follows the sd_listen_fds(3) protocol: the sockets start at file
+    descriptor SD_LISTEN_FDS_START and are only meant for us if LISTEN_PID
+    matches our PID. The LISTEN_* variables are removed afterwards so
+    child processes don't pick them up.
+    """
+    listen_pid = os.environ.pop('LISTEN_PID', None)
+    listen_fds = os.environ.pop('LISTEN_FDS', None)
+    os.environ.pop('LISTEN_FDNAMES', None)
+
+    if listen_pid is None or listen_fds is None or int(listen_pid) != os.getpid():
+        return []
+
+    sockets = []
+    for fd in range(SD_LISTEN_FDS_START, SD_LISTEN_FDS_START + int(listen_fds)):
+        os.set_inheritable(fd, False)
+        sockets.append(socket.socket(fileno=fd))
+    return sockets
+
+
+def sd_notify(message):
+    """
+    Send a state change to the service manager, see sd_notify(3).
+
+    Does nothing (and returns False) when not started by systemd with
+    Type=notify, i.e. when NOTIFY_SOCKET is not set.
+    """
+    address = os.environ.get('NOTIFY_SOCKET')
+    if not address:
+        return False
+    if address.startswith('@'):
+        address = '\0' + address[1:]  # Abstract namespace socket
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM | socket.SOCK_CLOEXEC) as notify_socket:
+            notify_socket.sendto(message.encode(), address)
+        return True
+    except OSError as e:
+        logging.error("[SYSTEMD] Failed to send `%s': %s", message.replace('\n', ' '), e)
+        return False
+
+
+def sd_watchdog_interval():
+    """
+    Return how often (in seconds) WATCHDOG=1 must be sent, or None if the
+    systemd watchdog is not enabled for this process.
+    """
+    watchdog_usec = os.environ.get('WATCHDOG_USEC')
+    watchdog_pid  = os.environ.get('WATCHDOG_PID')
+    if not watchdog_usec or (watchdog_pid and int(watchdog_pid) != os.getpid()):
+        return None
+    # Ping at half the timeout, as recommended by sd_watchdog_enabled(3)
+    return int(watchdog_usec) / 1e6 / 2
+
+
+async def systemd_watchdog(loop_stats, interval, critical_ms=LOOP_LAG_CRITICAL_MS):
+    """
+    Send WATCHDOG=1 every 'interval' seconds while the event loop is healthy.
+
+    A fully wedged loop can't run this task, so the pings stop on their own.
+    A loop that still runs but lags above 'critical_ms' also skips its ping,
+    so systemd restarts a daemon that is too slow to be useful.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        if loop_stats['last_ms'] >= critical_ms:
+            logging.warning("[SYSTEMD] Event loop lag %.0f ms -- withholding watchdog ping",
+                            loop_stats['last_ms'])
+            continue
+        sd_notify("WATCHDOG=1")
+
+
+async def systemd_notify_ready(vehicle_configs, vehicle_states, timeout=SD_READY_TIMEOUT):
+    """
+    Send READY=1 once every vehicle has reported its first battery sample.
+
+    Vehicles that can't be polled (privacy mode, unsupported endpoint)
+    would hold up readiness forever, so READY=1 is sent after 'timeout'
+    seconds regardless.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline \
+          and not all(name in vehicle_states for name in vehicle_configs):
+        await asyncio.sleep(1)
+
+    polled = sum(name in vehicle_states for name in vehicle_configs)
+    sd_notify(f"READY=1\nSTATUS=Monitoring {polled}/{len(vehicle_configs)} vehicles")
+    logging.info("Ready -- first battery status received for %d/%d vehicles",
+                 polled, len(vehicle_configs))
+
+
+class LeaseLostError(Exception):
+    """Raised by hold_lease() or LeaseFence when this instance is no longer the leader."""
+
+
+class LeaseFence:
+    """
+    Local deadline until which this instance may act as the leader.
+
+    hold_lease() only notices a lost lease at its next renewal, which is
+    too late if the process was paused (SIGSTOP, VM freeze) or the event
+    loop stalled for longer than the TTL: the overdue polls and actions
+    would run right after resuming, next to the new leader. So every
+    successful acquire moves the deadline to 'started_at + ttl' minus a
+    LEASE_FENCE_MARGIN, on the monotonic clock, and check() must be called
+    before anything reaches upstream.
+
+    Without a TTL (high availability disabled) the fence never closes.
+    """
+
+    __slots__ = ('ttl', 'deadline')
+
+    def __init__(self, ttl=None):
+        self.ttl      = ttl
+        self.deadline = math.inf if ttl is None else -math.inf  # Monotonic time
+
+    def renewed(self, started_at):
+        """Record a successful acquire that was started at monotonic 'started_at'."""
+        self.deadline = started_at + self.ttl * (1 - LEASE_FENCE_MARGIN)
+
+    def revoke(self):
+        """Close the fence until the lease is acquired again."""
+        if self.ttl is not None:
+            self.deadline = -math.inf
+
+    def check(self):
+        """Raise LeaseLostError if the lease may have expired by now."""
+        if time.monotonic() >= self.deadline:
+            raise LeaseLostError("leader lease not held or about to expire")
+
+
+class LeaseBackend:
+    """
+    Interface of a leader lease shared by the instances of one deployment.
+
+    A lease has at most one holder at a time and expires 'ttl' seconds
+    after it was last acquired unless renewed. Implementations must make
+    acquire() atomic across processes (and hosts, for networked backends),
+    and compare expiry times on a clock shared by all instances.
+
+    Both methods are blocking and are run through asyncio.to_thread().
+    Register new implementations in LEASE_BACKENDS.
+    """
+
+    def acquire(self, holder, ttl):
+        """
+        Take or renew the lease for 'holder' for 'ttl' seconds.
+
+        Succeeds if the lease is free, expired or already held by 'holder'.
+        Returns True if 'holder' now holds the lease, False otherwise.
+        """
+        raise NotImplementedError
+
+    def release(self, holder):
+        """Give the lease up early, if 'holder' holds it."""
+        raise NotImplementedError
+
+
+class FileLeaseBackend(LeaseBackend):
+    """
+    Lease stored as JSON in a local file, guarded by flock().
+
+    Only suitable for instances on the same host (flock() is not reliable
+    on network file systems).
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def _update(self, holder, ttl):
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        with open(fd, 'r+', encoding='utf-8') as lease_file:
+            fcntl.flock(lease_file, fcntl.LOCK_EX)  # Released when the file is closed
+            try:
+                current = json.loads(lease_file.read() or '{}')
+            except ValueError:
+                current = {}  # Torn / corrupt lease file -- treat it as free
+
+            now = time.time()
+            if current.get('holder') not in (None, holder) and current.get('expires', 0) > now:
+                return False
+
+            if ttl is None and current.get('holder') != holder:
+                return False  # Releasing a lease we don't hold
+
+            lease_file.seek(0)
+            lease_file.truncate()
+            json.dump({'holder':  holder if ttl is not None else None,
+                       'expires': now + ttl if ttl is not None else 0}, lease_file)
+            lease_file.flush()
+            os.fsync(lease_file.fileno())
+            return True
+
+    def acquire(self, holder, ttl):
+        return self._update(holder, ttl)
+
+    def release(self, holder):
+        self._update(holder, None)
+
+
+class SqliteLeaseBackend(LeaseBackend):
+    """
+    Lease stored as a row of a SQLite database, one row per lease name.
+
+    Several deployments can share one database by using different names.
+    """
+
+    def __init__(self, path, name=PROJECT_NAME, timeout=5.0):
+        self.path    = path
+        self.name    = name
+        self.timeout = timeout
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+        connection.execute("CREATE TABLE IF NOT EXISTS lease "
+                           "(name TEXT PRIMARY KEY, holder TEXT, expires REAL NOT NULL)")
+        return connection
+
+    def acquire(self, holder, ttl):
+        connection = self._connect()
+        try:
+            now = time.time()
+            connection.execute("BEGIN IMMEDIATE")
+            connection.execute("INSERT OR IGNORE INTO lease VALUES (?, NULL, 0)", (self.name,))
+            cursor = connection.execute(
+                "UPDATE lease SET holder = ?, expires = ? "
+                "WHERE name = ? AND (holder = ? OR holder IS NULL OR expires <= ?)",
+                (holder, now + ttl, self.name, holder, now))
+            connection.execute("COMMIT")
+            return cursor.rowcount == 1
+        finally:
+            connection.close()
+
+    def release(self, holder):
+        connection = self._connect()
+        try:
+            connection.execute("UPDATE lease SET holder = NULL, expires = 0 "
+                               "WHERE name = ? AND holder = ?", (self.name, holder))
+        finally:
+            connection.close()
+
+
+LEASE_BACKENDS = {
+    'file':   FileLeaseBackend,
+    'sqlite': SqliteLeaseBackend,
+}
+
+
+async def wait_for_leadership(lease, holder, ttl=LEASE_TTL, keep_warm=None,
+                              keep_warm_interval=LEASE_KEEP_WARM_INTERVAL, fence=None):
+    """
+    Wait as standby until 'holder' acquires the leader lease.
+
+    The lease is retried every ttl/5 seconds, so a crashed leader is
+    replaced at most about 1.2 * ttl after its last renewal, and right away
+    after a clean shutdown (which releases the lease). 'keep_warm' is an
+    optional coroutine function awaited every 'keep_warm_interval' seconds
+    while standby, e.g. to keep login tokens fresh. Its errors are logged
+    and don't end the standby -- the lease keeps being retried. 'fence', a
+    LeaseFence, is opened once the lease is acquired.
+    """
+    next_keep_warm = time.monotonic() + keep_warm_interval
+    standby_logged = False
+    while True:
+        started_at = time.monotonic()
+        if await asyncio.to_thread(lease.acquire, holder, ttl):
+            break
+
+        if not standby_logged:
+            logging.info("[HA] Another instance holds the leader lease -- standing by")
+            sd_notify("READY=1\nSTATUS=Standby")
+            standby_logged = True
+
+        if keep_warm is not None and time.monotonic() >= next_keep_warm:
+            next_keep_warm = time.monotonic() + keep_warm_interval
+            try:
+                await keep_warm()
+            except Exception as e:
+                # A network or auth hiccup must not delay a takeover -- the
+                # main loop deals with the login again once we are leader
+                logging.warning("[HA] Keeping warm while standby failed: %s", e)
+
+        await asyncio.sleep(ttl / 5)
+
+    if fence is not None:
+        fence.renewed(started_at)
+    logging.info("[HA] Acquired the leader lease as `%s'", holder)
+
+
+async def hold_lease(lease, holder, ttl=LEASE_TTL, fence=None):
+    """
+    Renew the leader lease every ttl/3 seconds while leader.
+
+    Raises LeaseLostError if another instance took the lease over, or if
+    renewing kept failing until the lease is about to expire -- the caller
+    must then stop polling and acting before a standby takes over. Every
+    renewal also moves the deadline of 'fence', a LeaseFence.
+    """
+    renew_interval = ttl / 3
+    renewed_at     = time.monotonic()
+    while True:
+        await asyncio.sleep(renew_interval)
+        try:
+            started_at = time.monotonic()
+            if not await asyncio.to_thread(lease.acquire, holder, ttl):
+                raise LeaseLostError("leader lease was taken over by another instance")
+            renewed_at = started_at
+            if fence is not None:
+                fence.renewed(started_at)
+
+        except (OSError, sqlite3.Error) as e:
+            logging.warning("[HA] Failed to renew the leader lease: %s", e)
+            if time.monotonic() - renewed_at >= ttl - renew_interval:
+                raise LeaseLostError(f"could not renew the leader lease: {e}") from e
+
+
+class NtfyTarget:
+    """NTFY topic and credentials, shared by every vehicle that uses them."""
+
+    __slots__ = ('uri', 'username', 'password')
+
+    def __init__(self, uri, username, password):
+        self.uri      = uri
+        self.username = username
+        self.password = password
+
+
+class VehicleConfig:
+    """
+    Read-only per-vehicle settings parsed from a 'Cars' config entry.
+
+    Uses __slots__ instead of the raw JSON dict, and vehicles pointing at
+    the same NTFY topic with the same credentials share one NtfyTarget.
+    """
+
+    __slots__ = ('nickname', 'vin', 'warn_battery_percentage', 'min_battery_percentage',
+                 'max_battery_temperature', 'check_time', 'max_tries', 'ntfy')
+
+    def __init__(self, nickname, vin, warn_battery_percentage, min_battery_percentage,
+                 max_battery_temperature, check_time, max_tries, ntfy):
+        self.nickname                = sys.intern(nickname)
+        self.vin                     = vin
+        self.warn_battery_percentage = warn_battery_percentage
+        self.min_battery_percentage  = min_battery_percentage
+        self.max_battery_temperature = max_battery_temperature
+        self.check_time              = check_time
+        self.max_tries               = max_tries
+        self.ntfy                    = ntfy
+
+    @classmethod
+    def from_config(cls, nickname, config_vehicle, ntfy_targets):
+        """
+        Build a VehicleConfig from its config file dictionary.
+
+        'ntfy_targets' -- dict used to deduplicate NtfyTarget objects,
+                          shared between all calls for the same config
+        """
+        ntfy_key = (config_vehicle['NTFY_topic'],
+                    config_vehicle['NTFY_auth']['username'],
+                    config_vehicle['NTFY_auth']['password'])
+        if ntfy_key not in ntfy_targets:
+            ntfy_targets[ntfy_key] = NtfyTarget(*ntfy_key)
+
+        return cls(nickname,
+                   config_vehicle['VIN'],
+                   config_vehicle['warn_battery_percentage'],
+                   config_vehicle['min_battery_percentage'],
+                   config_vehicle['max_battery_temperature'],
+                   config_vehicle['check_time'],
+                   config_vehicle['max_tries'],
+                   ntfy_targets[ntfy_key])
+
+
+class VehicleState:
+    """
+    Mutable alerting / charging status checkers of one monitored vehicle.
+
+    'battery_percentage_checked' is a bit set of BATTERY_CHECKED_WARN and
+    BATTERY_CHECKED_MIN; checked_list() and charge_dict() give the same
+    shapes the status checkers had as plain dicts, for event payloads.
+    """
+
+    __slots__ = ('battery_percentage_checked', 'charge_count', 'charge_hvac',
+                 'charge_notified', 'battery_temp_notified', 'battery_charged_notified')
+
+    def __init__(self):
+        self.battery_percentage_checked = 0
+        self.charge_count               = 0
+        self.charge_hvac                = False
+        self.charge_notified            = False
+        self.battery_temp_notified      = False
+        self.battery_charged_notified   = False
+
+    def checked_list(self):
+        """Return battery_percentage_checked as a list of 'warn' / 'min'."""
+        return [name for bit, name in ((BATTERY_CHECKED_WARN, 'warn'), (BATTERY_CHECKED_MIN, 'min'))
+                if self.battery_percentage_checked & bit]
+
+    def charge_dict(self):
+        """Return the charging retry state as a dictionary."""
+        return {'count': self.charge_count, 'hvac': self.charge_hvac,
+                'notified': self.charge_notified}
+
+
+class VehicleSample:
+    """Last valid battery sample of a vehicle, as served by GET /vehicles."""
+
+    __slots__ = ('battery_percentage', 'battery_plugged', 'battery_temperature',
+                 'battery_charging', 'timestamp')
+
+    def __init__(self, battery_percentage, battery_plugged, battery_temperature,
+                 battery_charging, timestamp):
+        self.battery_percentage  = battery_percentage
+        self.battery_plugged     = bool(battery_plugged)
+        self.battery_temperature = battery_temperature
+        self.battery_charging    = battery_charging
+        self.timestamp           = timestamp
+
+    @property
+    def etag(self):
+        """Changes with every new sample and never otherwise."""
+        return '%x' % int(self.timestamp * 1000)
+
+
+class BatterySample:
+    """Event published by create_vehicle() for every valid battery sample."""
+
+    __slots__ = ('vehicle_config', 'vehicle', 'sample')
+
+    def __init__(self, vehicle_config, vehicle, sample):
+        self.vehicle_config = vehicle_config  # VehicleConfig
+        self.vehicle        = vehicle         # renault_api vehicle, for remediation actions
+        self.sample         = sample          # VehicleSample
+
+
+class EventBroadcaster:
+    """
+    Fan-out of live events to Server-Sent Events subscribers.
+
+    Each event is serialised exactly once in publish() and the resulting
+    bytes object is shared by every subscriber queue. Queues are bounded:
+    a subscriber that falls EVENT_QUEUE_SIZE events behind is dropped
+    instead of making publish() wait or buffering without limit.
+    """
+
+    def __init__(self, queue_size=EVENT_QUEUE_SIZE):
+        self._queue_size  = queue_size
+        self._subscribers = set()
+        self._event_id    = 0
+
+    def subscribe(self):
+        """Register a new subscriber and return its queue."""
+        queue = asyncio.Queue(maxsize=self._queue_size)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue):
+        """Forget a subscriber queue; safe to call more than once."""
+        self._subscribers.discard(queue)
+
+    def publish(self, event, data):
+        """
+        Encode an event once and queue it for every subscriber.
+
+        A subscriber whose queue is full has its backlog discarded and
+        receives a None sentinel, telling its handler to close the stream.
+        """
+        if not self._subscribers:
+            return  # Nobody listening -- skip the encoding entirely
+
+        self._event_id += 1
+        payload = (f"id: {self._event_id}\n"
+                   f"event: {event}\n"
+                   f"data: {json.dumps(data, separators=(',', ':'))}\n\n").encode()
+
+        for queue in tuple(self._subscribers):
+            try:
+                queue.put_nowait(payload)
+            except asyncio.QueueFull:
+                logging.warning("[EVENTS] Dropping slow subscriber (%d events behind)",
+                                queue.qsize())
+                self._subscribers.discard(queue)
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+
+    def close(self):
+        """
+        Send every subscriber the None sentinel and forget them all.
+
+        Called when the HVAC listener shuts down, so open streams end
+        right away instead of holding up the server cleanup.
+        """
+        for queue in self._subscribers:
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(None)
+        self._subscribers.clear()
+
+
 ### FUNCTIONS ###
 
 async def print_help():
@@ -117,7 +791,9 @@ async def print_help():
           '-c, --config      Set another configuration file than the default\n'
           '                  `%s` configuration file\n'
           '\n'
-          '-p, --port        Set HVAC HTTP listener port (0-65535)'
+          '-p, --port        Set HVAC HTTP listener port (0-65535)\n'
+          '-U, --uvloop      Run on uvloop instead of the default asyncio event loop\n'
+          '                  (if it is installed)'
           % (PROJECT_NAME, sys.argv[0], JSON_CONFIG_FILE_PATH))
 
 
@@ -155,6 +831,9 @@ async def send_ntfy_notification(ntfy_session, uri, username, password,
     'message'  -- Notification body
     'emoji'    -- Tag emoji(s)
     'priority' -- NTFY priority string
+
+    Returns True if NTFY accepted the notification; failures are logged
+    here and return False.
     """
     headers = {
         'Title':    title,
@@ -168,10 +847,28 @@ async def send_ntfy_notification(ntfy_session, uri, username, password,
                 logging.error("[NTFY] Failed to send notification -- HTTP status `%s`", response.status)
             else:
                 logging.debug("[NTFY] Notification sent successfully")
+                return True
     except aiohttp.ClientError as e:
         logging.error("[NTFY] HTTP request error: %s", e)
     except Exception as e:
         logging.error("[NTFY] Unexpected error: %s", e)
+    return False
+
+
+async def send_vehicle_notification(ntfy_session, vehicle_config, template, value):
+    """
+    Send one of the NOTIFICATION_TEMPLATES to a vehicle's NTFY topic.
+
+    'template' -- key in NOTIFICATION_TEMPLATES
+    'value'    -- reading shown in the message (battery %, temperature)
+
+    Returns the result of send_ntfy_notification().
+    """
+    title, message, emoji, priority = NOTIFICATION_TEMPLATES[template]
+    fields = {'name': vehicle_config.nickname, 'value': value}
+    ntfy   = vehicle_config.ntfy
+    return await send_ntfy_notification(ntfy_session, ntfy.uri, ntfy.username, ntfy.password,
+                                 title % fields, message % fields, emoji, priority)
 
 
 async def charging_start(vehicle):
@@ -236,9 +933,317 @@ async def hvac_start(vehicle):
     # All other exceptions propagate upward
 
 
-async def create_vehicle(ntfy_session, account, config_vehicle, vehicle_nickname):
+def record_vehicle_state(vehicle_states, events, vehicle_nickname, sample):
+    """
+    Store the last battery sample of a vehicle for the read-only HTTP API
+    and publish it as a 'sample' event.
+
+    Samples are replaced as a whole (never mutated in place), so a request
+    handler always sees a consistent sample.
+    """
+    vehicle_states[vehicle_nickname] = sample
+    events.publish('sample', {'vehicle': vehicle_nickname,
+                              **vehicle_state_payload(sample, sample.timestamp)})
+
+
+def evaluate_battery_sample(vehicle_config, state, battery_percentage, battery_plugged,
+                            battery_temperature, battery_not_charging):
+    """
+    Advance the alerting / charging state machine of a vehicle by one sample.
+
+    Updates 'state' in place and returns the actions to carry out, in order.
+    Performs no I/O and no logging (actions are logged when carried out),
+    so recorded battery traces can be replayed through it offline (see
+    tools/replay.py). Actions are tuples:
+
+      (ACTION_NOTIFY, template, value)  -- send a NOTIFICATION_TEMPLATES entry
+      (ACTION_CHARGING_START,)          -- call charging_start()
+      (ACTION_HVAC_START,)              -- call hvac_start()
+      (ACTION_ALERT, checker, value)    -- publish a status checker transition
+
+    The None checks on the sample are the caller's job.
+    """
+    actions = []
+
+    ## --- Low battery check ---
+    if battery_percentage <= vehicle_config.warn_battery_percentage \
+       and not battery_plugged \
+       and not state.battery_percentage_checked & BATTERY_CHECKED_MIN:
+
+        if battery_percentage <= vehicle_config.min_battery_percentage:
+            actions.append((ACTION_NOTIFY, 'battery_critical', battery_percentage))
+            state.battery_percentage_checked |= BATTERY_CHECKED_MIN
+            actions.append((ACTION_ALERT, 'battery_percentage_checked', state.checked_list()))
+
+        elif not state.battery_percentage_checked & BATTERY_CHECKED_WARN:
+            actions.append((ACTION_NOTIFY, 'battery_low', battery_percentage))
+            state.battery_percentage_checked |= BATTERY_CHECKED_WARN
+            actions.append((ACTION_ALERT, 'battery_percentage_checked', state.checked_list()))
+
+    elif battery_plugged and state.battery_percentage_checked:
+        # Charger plugged in -- reset low-battery alerts regardless of level
+        state.battery_percentage_checked = 0
+        actions.append((ACTION_ALERT, 'battery_percentage_checked', []))
+
+    ## --- Charging stopped check ---
+    if battery_plugged and battery_percentage < 98:
+        state.battery_charged_notified = False
+
+        if battery_not_charging:
+            if state.charge_count <= vehicle_config.max_tries:
+                actions.append((ACTION_CHARGING_START,))
+                state.charge_count += 1
+                actions.append((ACTION_ALERT, 'charge_dict', state.charge_dict()))
+
+            elif not state.charge_hvac:
+                actions.append((ACTION_HVAC_START,))
+                state.charge_hvac = True
+                actions.append((ACTION_ALERT, 'charge_dict', state.charge_dict()))
+
+            elif not state.charge_notified:
+                actions.append((ACTION_NOTIFY, 'charge_refused', battery_percentage))
+                state.charge_notified = True
+                actions.append((ACTION_ALERT, 'charge_dict', state.charge_dict()))
+
+    elif battery_percentage >= 98:
+        # Fully charged -- reset all charging state
+        if state.charge_count or state.charge_hvac or state.charge_notified:
+            state.charge_count    = 0
+            state.charge_hvac     = False
+            state.charge_notified = False
+            actions.append((ACTION_ALERT, 'charge_dict', state.charge_dict()))
+
+        if battery_plugged and not state.battery_charged_notified:
+            actions.append((ACTION_NOTIFY, 'charged', battery_percentage))
+            state.battery_charged_notified = True
+
+    ## --- Battery temperature check ---
+    if type(battery_temperature) is not NoneType:
+        if battery_temperature > vehicle_config.max_battery_temperature \
+           and not state.battery_temp_notified:
+            actions.append((ACTION_NOTIFY, 'battery_temp_high', battery_temperature))
+            state.battery_temp_notified = True
+            actions.append((ACTION_ALERT, 'battery_temp_notified', True))
+
+        # Only clear after temperature drops to max - 3 deg to avoid flapping
+        elif battery_temperature - 3 <= vehicle_config.max_battery_temperature \
+             and state.battery_temp_notified:
+            state.battery_temp_notified = False
+            actions.append((ACTION_ALERT, 'battery_temp_notified', False))
+
+    return actions
+
+
+class PipelineStage:
+    """
+    One consumer stage of the SamplePipeline: bounded queues and workers.
+
+    Items enter either through offer(), which never waits and drops the
+    oldest queued item when the queue is full (used by the producer, so
+    polling never waits on consumers), or through put(), which waits for
+    room (backpressure between stages, where nothing may be lost).
+    Exceptions raised by 'handler' end the worker and propagate to main(),
+    just like they did when the work ran inside create_vehicle().
+
+    With a 'key' function, every worker gets its own queue and items with
+    the same key always go to the same worker, so they are handled in the
+    order they were queued while different keys still run concurrently.
+    Without one, all workers share a single queue.
     """
-    Run vehicle monitoring as a long-lived asyncio task.
+
+    def __init__(self, name, handler, workers=1, queue_size=PIPELINE_QUEUE_SIZE, key=None):
+        self.name      = name
+        self._handler  = handler
+        self._workers  = workers
+        self._key      = key
+        self._queues   = [asyncio.Queue(maxsize=queue_size)
+                          for _ in range(workers if key is not None else 1)]
+        self._routes   = {}  # key -> index in _queues, assigned round-robin
+        self.processed = 0
+        self.dropped   = 0
+        self.latency   = {'last_ms': 0.0, 'avg_ms': 0.0, 'max_ms': 0.0}
+
+    def _queue_for(self, item):
+        if self._key is None:
+            return self._queues[0]
+        key   = self._key(item)
+        index = self._routes.get(key)
+        if index is None:
+            index = self._routes[key] = len(self._routes) % len(self._queues)
+        return self._queues[index]
+
+    def offer(self, item):
+        """Queue 'item' without waiting, dropping the oldest item if full."""
+        queue = self._queue_for(item)
+        if queue.full():
+            queue.get_nowait()
+            queue.task_done()
+            self.dropped += 1
+            logging.warning("[PIPELINE] `%s' stage is falling behind -- dropped oldest item",
+                            self.name)
+        queue.put_nowait((time.monotonic(), item))
+
+    async def put(self, item):
+        """Queue 'item', waiting while the queue is full."""
+        await self._queue_for(item).put((time.monotonic(), item))
+
+    def metrics(self):
+        """Return the stage's queue depth, counters and latency (enqueue to done)."""
+        return {'queued': sum(queue.qsize() for queue in self._queues), 'workers': self._workers,
+                'processed': self.processed, 'dropped': self.dropped, **self.latency}
+
+    async def _work(self, queue):
+        while True:
+            queued_at, item = await queue.get()
+            try:
+                await self._handler(item)
+            finally:
+                queue.task_done()
+
+            latency_ms = (time.monotonic() - queued_at) * 1000
+            self.processed += 1
+            self.latency['last_ms'] = round(latency_ms, 3)
+            self.latency['max_ms']  = max(self.latency['max_ms'], self.latency['last_ms'])
+            self.latency['avg_ms']  = round(self.latency['avg_ms']
+                                            + (latency_ms - self.latency['avg_ms']) / 100, 3)
+
+    def start(self):
+        """
+        Start the stage's workers and return their tasks.
+
+        Items left over from before a main-loop retry are discarded (and
+        counted as dropped): they may belong to a leadership term another
+        instance has taken over since.
+        """
+        for queue in self._queues:
+            while not queue.empty():
+                queue.get_nowait()
+                queue.task_done()
+                self.dropped += 1
+        return [asyncio.create_task(self._work(self._queues[index % len(self._queues)]),
+                                    name=f"pipeline-{self.name}-{index}")
+                for index in range(self._workers)]
+
+
+class SamplePipeline:
+    """
+    Fan-out of BatterySample events from the polling tasks to the consumers.
+
+      history       -- cache the sample for GET /vehicles, publish 'sample'
+      alerting      -- run evaluate_battery_sample(), publish 'alert' events
+                       and hand actions to the two stages below
+      remediation   -- charging_start() / hvac_start()
+      notifications -- NTFY pushes, several vehicles at a time
+
+    create_vehicle() only calls publish(), which never waits, so a slow
+    NTFY server or Kamereon action no longer delays the next poll. The
+    alerting stage has a single worker because it owns the per-vehicle
+    VehicleState and must see each vehicle's samples in order. The two
+    action stages are keyed by vehicle, so each vehicle's notifications
+    and actions go out in the order they were decided. Both check 'fence'
+    (a LeaseFence) before reaching upstream, so a leader that resumes
+    after its lease expired doesn't act next to the new one.
+    """
+
+    def __init__(self, ntfy_session, vehicle_states, events, fence,
+                 notification_workers=PIPELINE_NOTIFICATION_WORKERS,
+                 remediation_workers=PIPELINE_REMEDIATION_WORKERS):
+        self._ntfy_session   = ntfy_session
+        self._vehicle_states = vehicle_states
+        self._events         = events
+        self._fence          = fence
+        self._states         = {}  # VehicleState per vehicle nickname
+
+        self.history       = PipelineStage('history', self._handle_history)
+        self.alerting      = PipelineStage('alerting', self._handle_alerting)
+        self.remediation   = PipelineStage('remediation', self._handle_remediation,
+                                           workers=remediation_workers,
+                                           key=lambda item: item[0].vehicle_config.nickname)
+        self.notifications = PipelineStage('notifications', self._handle_notification,
+                                           workers=notification_workers,
+                                           key=lambda item: item[0].nickname)
+        self.stages        = (self.history, self.alerting, self.remediation, self.notifications)
+
+    def publish(self, event):
+        """Hand a new BatterySample to the pipeline; never waits."""
+        self.history.offer(event)
+        self.alerting.offer(event)
+
+    def start(self):
+        """
+        Start all stages and return their worker tasks.
+
+        The pipeline outlives main-loop retries so its metrics keep adding
+        up; the alerting state starts over on every start(), as it did when
+        each retry recreated the vehicle tasks.
+        """
+        self._states.clear()
+        return [task for stage in self.stages for task in stage.start()]
+
+    def metrics(self):
+        """Return per-stage metrics for GET /debug/pipeline."""
+        return {stage.name: stage.metrics() for stage in self.stages}
+
+    async def _handle_history(self, event):
+        record_vehicle_state(self._vehicle_states, self._events,
+                             event.vehicle_config.nickname, event.sample)
+
+    async def _handle_alerting(self, event):
+        vehicle_config = event.vehicle_config
+        sample         = event.sample
+        state          = self._states.get(vehicle_config.nickname)
+        if state is None:
+            state = self._states[vehicle_config.nickname] = VehicleState()
+
+        actions = evaluate_battery_sample(vehicle_config, state,
+                                          sample.battery_percentage, sample.battery_plugged,
+                                          sample.battery_temperature, not sample.battery_charging)
+        for action in actions:
+            if action[0] == ACTION_ALERT:
+                logging.debug("[%s] Status checker `%s' is now %s - %s%%",
+                              vehicle_config.nickname, action[1], action[2],
+                              sample.battery_percentage)
+                self._events.publish('alert', {'vehicle': vehicle_config.nickname,
+                                               'checker': action[1], 'value': action[2]})
+            elif action[0] == ACTION_NOTIFY:
+                await self.notifications.put((vehicle_config, action[1], action[2]))
+            else:
+                await self.remediation.put((event, action[0]))
+
+    async def _handle_remediation(self, item):
+        event, action    = item
+        vehicle_nickname = event.vehicle_config.nickname
+        self._fence.check()
+        if action == ACTION_CHARGING_START:
+            if await charging_start(event.vehicle) is not None:
+                logging.debug("[%s] Executed charging_start() - %s%%",
+                              vehicle_nickname, event.sample.battery_percentage)
+
+        elif action == ACTION_HVAC_START:
+            response = await hvac_start(event.vehicle)
+            if response is not None:
+                logging.debug("[%s] HVAC started because charging_start() kept failing - %s%%",
+                              vehicle_nickname, event.sample.battery_percentage)
+            self._events.publish('hvac', {'vehicle': vehicle_nickname,
+                                          'source':  'charge_fallback',
+                                          'started': response is not None})
+
+    async def _handle_notification(self, item):
+        vehicle_config, template, value = item
+        self._fence.check()
+        if await send_vehicle_notification(self._ntfy_session, vehicle_config, template, value):
+            logging.debug("[%s] NTFY sent `%s' notification - %s",
+                          vehicle_config.nickname, template, value)
+
+
+async def create_vehicle(account, vehicle_config, pipeline, fence):
+    """
+    Poll the battery status of a vehicle as a long-lived asyncio task.
+
+    Every valid sample is published to the SamplePipeline, which does the
+    alerting, charging remediation and notifications in its own tasks;
+    this loop only fetches and sleeps, so its cadence doesn't depend on
+    how slow those consumers are.
 
     Transient API errors (privacy mode, quota, upstream issues) are caught
     inside the polling loop and cause a short sleep + retry instead of
@@ -246,29 +1251,20 @@ async def create_vehicle(ntfy_session, account, config_vehicle, vehicle_nickname
     task for this vehicle. Auth errors propagate up to main() so it can
     trigger a re-login.
 
-    'ntfy_session'     -- Shared aiohttp.ClientSession for NTFY calls
-    'account'          -- Kamereon account object
-    'config_vehicle'   -- Per-vehicle config dictionary
-    'vehicle_nickname' -- Human-readable name from config file
+    'account'        -- Kamereon account object
+    'vehicle_config' -- VehicleConfig of the monitored vehicle
+    'pipeline'       -- SamplePipeline receiving the BatterySample events
+    'fence'          -- LeaseFence checked before every poll; LeaseLostError
+                        propagates to main() like auth errors do
     """
+    vehicle_nickname = vehicle_config.nickname
+
     try:
-        vehicle       = await account.get_api_vehicle(config_vehicle['VIN'])
-        ntfy_uri      = config_vehicle['NTFY_topic']
-        ntfy_username = config_vehicle['NTFY_auth']['username']
-        ntfy_password = config_vehicle['NTFY_auth']['password']
-
-        status_checkers = {
-            'battery_percentage_checked': [],
-            'charge_dict': {
-                'count':    0,
-                'hvac':     False,
-                'notified': False,
-            },
-            'battery_temp_notified':    False,
-            'battery_charged_notified': False,
-        }
+        vehicle = await account.get_api_vehicle(vehicle_config.vin)
 
         while True:
+            fence.check()
+
             # --- Fetch battery status with per-exception retry logic ---
             try:
                 battery_status = await vehicle.get_battery_status()
@@ -337,154 +1333,62 @@ async def create_vehicle(ntfy_session, account, config_vehicle, vehicle_nickname
                 del battery_status
                 continue
 
-            ## --- Low battery check ---
-            if battery_percentage <= config_vehicle['warn_battery_percentage'] \
-               and not battery_plugged \
-               and 'min' not in status_checkers['battery_percentage_checked']:
-
-                if battery_percentage <= config_vehicle['min_battery_percentage']:
-                    title    = f"[{vehicle_nickname}] NIVEL BATERIE CRITIC!"
-                    message  = f"Nivelul bateriei a '{vehicle_nickname}' este critic - {battery_percentage}%"
-                    emoji    = "red_square"
-                    priority = "urgent"
-                    await send_ntfy_notification(ntfy_session, ntfy_uri, ntfy_username, ntfy_password,
-                                                 title, message, emoji, priority)
-                    status_checkers['battery_percentage_checked'].append('min')
-                    logging.debug("[%s] NTFY alerted for very low battery - %s%%",
-                                  vehicle_nickname, battery_percentage)
-
-                elif 'warn' not in status_checkers['battery_percentage_checked']:
-                    title    = f"[{vehicle_nickname}] Nivel baterie scazut!"
-                    message  = f"Nivelul bateriei a '{vehicle_nickname}' este scazut - {battery_percentage}%"
-                    emoji    = "warning"
-                    priority = "high"
-                    await send_ntfy_notification(ntfy_session, ntfy_uri, ntfy_username, ntfy_password,
-                                                 title, message, emoji, priority)
-                    status_checkers['battery_percentage_checked'].append('warn')
-                    logging.debug("[%s] NTFY warned for low battery - %s%%",
-                                  vehicle_nickname, battery_percentage)
-
-            elif battery_plugged:
-                # Charger plugged in -- reset low-battery alerts regardless of level
-                status_checkers['battery_percentage_checked'].clear()
-                logging.debug("[%s] Cleared 'battery_percentage_checked' status checker",
-                              vehicle_nickname)
-
-            ## --- Charging stopped check ---
-            if battery_plugged and battery_percentage < 98:
-                status_checkers['battery_charged_notified'] = False
-
-                if battery_not_charging:
-                    if status_checkers['charge_dict']['count'] <= config_vehicle['max_tries']:
-                        await charging_start(vehicle)
-                        status_checkers['charge_dict']['count'] += 1
-                        logging.debug("[%s] Executed charging_start(), count at %s - %s%%",
-                                      vehicle_nickname,
-                                      status_checkers['charge_dict']['count'],
-                                      battery_percentage)
-
-                    elif not status_checkers['charge_dict']['hvac']:
-                        await hvac_start(vehicle)
-                        status_checkers['charge_dict']['hvac'] = True
-                        logging.debug("[%s] HVAC started because charging_start() failed %s times - %s%%",
-                                      vehicle_nickname,
-                                      status_checkers['charge_dict']['count'],
-                                      battery_percentage)
-
-                    elif not status_checkers['charge_dict']['notified']:
-                        title    = f"[{vehicle_nickname}] EV REFUZA SA SE INCARCE!"
-                        message  = f"Vehiculul '{vehicle_nickname}' refuza sa se incarce - {battery_percentage}%"
-                        emoji    = "electric_plug"
-                        priority = "min"
-                        await send_ntfy_notification(ntfy_session, ntfy_uri, ntfy_username, ntfy_password,
-                                                     title, message, emoji, priority)
-                        status_checkers['charge_dict']['notified'] = True
-                        logging.debug("[%s] NTFY alerted for car refusing to charge - %s%%",
-                                      vehicle_nickname, battery_percentage)
-
-            elif battery_percentage >= 98:
-                # Fully charged -- reset all charging state
-                status_checkers['charge_dict']['count']    = 0
-                status_checkers['charge_dict']['hvac']     = False
-                status_checkers['charge_dict']['notified'] = False
-                logging.debug("[%s] Cleared charge_dict status checkers", vehicle_nickname)
-
-                if battery_plugged and not status_checkers['battery_charged_notified']:
-                    title    = f"[{vehicle_nickname}] EV s-a incarcat"
-                    message  = f"Vehiculul '{vehicle_nickname}' este incarcat - {battery_percentage}%"
-                    emoji    = "white_check_mark"
-                    priority = "default"
-                    await send_ntfy_notification(ntfy_session, ntfy_uri, ntfy_username, ntfy_password,
-                                                 title, message, emoji, priority)
-                    status_checkers['battery_charged_notified'] = True
-                    logging.debug("[%s] NTFY notified for fully charged car - %s%%",
-                                  vehicle_nickname, battery_percentage)
-
-            ## --- Battery temperature check ---
-            if type(battery_temperature) is not NoneType:
-                if battery_temperature > config_vehicle['max_battery_temperature'] \
-                   and not status_checkers['battery_temp_notified']:
-                    title    = f"[{vehicle_nickname}] TEMPERATURA BATERIE RIDICATA!"
-                    message  = (f"Vehiculul '{vehicle_nickname}' are temperatura bateriei "
-                                f"foarte mare - {battery_temperature} deg")
-                    emoji    = "stop_sign"
-                    priority = "urgent"
-                    await send_ntfy_notification(ntfy_session, ntfy_uri, ntfy_username, ntfy_password,
-                                                 title, message, emoji, priority)
-                    status_checkers['battery_temp_notified'] = True
-                    logging.debug("[%s] NTFY alerted for battery temperature too high - %s deg",
-                                  vehicle_nickname, battery_temperature)
-
-                # Only clear after temperature drops to max - 3 deg to avoid flapping
-                elif battery_temperature - 3 <= config_vehicle['max_battery_temperature']:
-                    status_checkers['battery_temp_notified'] = False
-                    logging.debug("[%s] Cleared battery_temp_notified status checker",
-                                  vehicle_nickname)
+            pipeline.publish(BatterySample(
+                vehicle_config, vehicle,
+                VehicleSample(battery_percentage, battery_plugged, battery_temperature,
+                              not battery_not_charging, time.time())))
 
             # Explicitly release the response object so the GC can reclaim it
             # before the next sleep interval, rather than waiting for the next
             # loop assignment to drop the reference.
             del battery_status
 
-            await asyncio.sleep(config_vehicle['check_time'] * 60)
+            await asyncio.sleep(vehicle_config.check_time * 60)
 
     except asyncio.CancelledError:
         logging.warning("[%s] Task cancelled", vehicle_nickname)
         raise
 
 
-async def http_request_handler(request, ntfy_session, account, config_dict):
+async def http_request_handler(request, ntfy_session, account, vehicle_configs, events, fence):
     """
     Handle POST requests from http_hvac_listener().
 
     Starts HVAC for the named vehicle if battery > 30%, otherwise sends a
-    NTFY alert explaining why it was skipped.
+    NTFY alert explaining why it was skipped. The outcome is published as
+    an 'hvac' event. Refused with 503 once the leader lease ('fence') may
+    have expired.
     """
+    vehicle_nickname = None
+
+    def publish_hvac(started, reason=None):
+        events.publish('hvac', {'vehicle': vehicle_nickname, 'source': 'http',
+                                'started': started, 'reason': reason})
+
     try:
         data             = await request.json()
         vehicle_nickname = data.get('Name')
 
-        if vehicle_nickname not in config_dict['Cars']:
+        if vehicle_nickname not in vehicle_configs:
             return aiohttp.web.json_response(
                 {'success': False, 'message': 'Vehicle name not found in the JSON config file!'},
                 status=404)
 
-        vehicle        = await account.get_api_vehicle(config_dict['Cars'][vehicle_nickname]['VIN'])
+        vehicle_config = vehicle_configs[vehicle_nickname]
+        vehicle        = await account.get_api_vehicle(vehicle_config.vin)
         battery_status = await vehicle.get_battery_status()
 
+        fence.check()
         if battery_status.batteryLevel > 30:
-            await hvac_start(vehicle)
+            response = await hvac_start(vehicle)
+            publish_hvac(response is not None)
             return aiohttp.web.json_response({'success': True})
 
+        publish_hvac(False, 'low_battery')
+
         # Battery too low to start HVAC -- notify via NTFY
-        ntfy_uri      = config_dict['Cars'][vehicle_nickname]['NTFY_topic']
-        ntfy_username = config_dict['Cars'][vehicle_nickname]['NTFY_auth']['username']
-        ntfy_password = config_dict['Cars'][vehicle_nickname]['NTFY_auth']['password']
-        title         = f"[{vehicle_nickname}] AC nu a pornit"
-        message       = (f"Vehiculul '{vehicle_nickname}' nu are suficienta baterie (sub 30%) "
-                         f"ca sa poata porni AC - {battery_status.batteryLevel}%")
-        await send_ntfy_notification(ntfy_session, ntfy_uri, ntfy_username, ntfy_password,
-                                     title, message, "battery", "default")
+        await send_vehicle_notification(ntfy_session, vehicle_config,
+                                        'hvac_low_battery', battery_status.batteryLevel)
         return aiohttp.web.json_response(
             {'success': False, 'message': 'Not enough battery to start AC (< 30%)'},
             status=403)
@@ -495,49 +1399,248 @@ async def http_request_handler(request, ntfy_session, account, config_dict):
 
     except PrivacyModeOnException as e:
         logging.warning("HVAC request rejected -- privacy mode is ON: %s", e)
+        publish_hvac(False, 'privacy_mode')
         return aiohttp.web.json_response(
             {'success': False, 'message': 'Privacy mode is ON'}, status=503)
 
     except (AccessDeniedException, ForbiddenException) as e:
         logging.warning("HVAC request rejected -- access denied (may be transient): %s", e)
+        publish_hvac(False, 'access_denied')
         return aiohttp.web.json_response(
             {'success': False, 'message': str(e)}, status=503)
 
+    except LeaseLostError as e:
+        logging.warning("HVAC request rejected -- not the leader any more: %s", e)
+        publish_hvac(False, 'not_leader')
+        return aiohttp.web.json_response(
+            {'success': False, 'message': 'Not the leader instance'}, status=503)
+
     except NotSupportedException as e:
         logging.error("HVAC not supported for this vehicle model: %s", e)
+        publish_hvac(False, 'not_supported')
         return aiohttp.web.json_response(
             {'success': False, 'message': str(e)}, status=501)
 
     except Exception as e:
         logging.exception("Unexpected error handling HTTP request: %s", e)
+        publish_hvac(False, 'error')
         return aiohttp.web.json_response(
             {'success': False, 'message': str(e)}, status=500)
 
 
-async def http_hvac_listener(ntfy_session, account, config_dict, port=HVAC_HTTP_LISTENER_PORT):
-    """Listen for POST requests and forward them to http_request_handler()."""
+def vehicle_state_payload(sample, now):
+    """Return the public JSON view of a VehicleSample."""
+    return {
+        'battery_percentage':  sample.battery_percentage,
+        'battery_plugged':     sample.battery_plugged,
+        'battery_temperature': sample.battery_temperature,
+        'battery_charging':    sample.battery_charging,
+        'sampled_at':          datetime.fromtimestamp(sample.timestamp, timezone.utc).isoformat(timespec='seconds'),
+        'sample_age':          max(0, int(now - sample.timestamp)),
+    }
+
+
+def http_conditional_response(request, payload, etag, last_modified):
+    """
+    Build a JSON response honouring If-None-Match / If-Modified-Since.
+
+    The ETag is weak because 'sample_age' keeps ticking between samples
+    while the underlying data stays the same. If-None-Match takes
+    precedence over If-Modified-Since, as required by RFC 9110.
+    """
+    not_modified = False
+    if request.if_none_match is not None:
+        not_modified = any(tag.value in (etag, '*') for tag in request.if_none_match)
+    elif request.if_modified_since is not None and last_modified is not None:
+        not_modified = int(last_modified) <= request.if_modified_since.timestamp()
+
+    if not_modified:
+        response = aiohttp.web.Response(status=304)
+    else:
+        response = aiohttp.web.json_response(payload)
+
+    response.etag = aiohttp.ETag(value=etag, is_weak=True)
+    if last_modified is not None:
+        response.last_modified = int(last_modified)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+async def http_vehicles_handler(request, vehicle_states):
+    """
+    Handle GET /vehicles from http_hvac_listener().
+
+    Serves the last samples seen by create_vehicle() without calling the
+    Renault API, so any number of clients can poll it at no Kamereon cost.
+    """
+    now     = time.time()
+    samples = sorted(vehicle_states.items())
+    etag    = hashlib.sha1(
+        ';'.join(f"{name}={sample.etag}" for name, sample in samples).encode()).hexdigest()[:16]
+    last_modified = max((sample.timestamp for _, sample in samples), default=None)
+
+    payload = {
+        'success':  True,
+        'vehicles': {name: vehicle_state_payload(sample, now) for name, sample in samples},
+    }
+    return http_conditional_response(request, payload, etag, last_modified)
+
+
+async def http_vehicle_handler(request, vehicle_configs, vehicle_states):
+    """Handle GET /vehicles/{name} from http_hvac_listener()."""
+    vehicle_nickname = request.match_info['name']
+
+    if vehicle_nickname not in vehicle_configs:
+        return aiohttp.web.json_response(
+            {'success': False, 'message': 'Vehicle name not found in the JSON config file!'},
+            status=404)
+
+    sample = vehicle_states.get(vehicle_nickname)
+    if sample is None:
+        return aiohttp.web.json_response(
+            {'success': False, 'message': 'No battery status received yet for this vehicle'},
+            status=503, headers={'Retry-After': str(WAIT_TRANSIENT)})
+
+    payload = {'success': True, 'vehicle': vehicle_state_payload(sample, time.time())}
+    return http_conditional_response(request, payload, sample.etag, sample.timestamp)
+
+
+async def http_events_handler(request, events):
+    """
+    Handle GET /events from http_hvac_listener() as a Server-Sent Events stream.
+
+    Events: 'sample' (new battery sample), 'alert' (status checker
+    transition) and 'hvac' (HVAC start outcome). Clients should fetch
+    GET /vehicles once for the initial state, then follow this stream.
+    """
+    response = aiohttp.web.StreamResponse(headers={
+        'Content-Type':      'text/event-stream',
+        'Cache-Control':     'no-cache',
+        'X-Accel-Buffering': 'no',
+    })
+    await response.prepare(request)
+
+    queue = events.subscribe()
+    logging.debug("[EVENTS] Subscriber connected from %s", request.remote)
+    try:
+        while True:
+            try:
+                payload = await asyncio.wait_for(queue.get(), SSE_KEEPALIVE)
+            except asyncio.TimeoutError:
+                payload = b': keepalive\n\n'
+
+            if payload is None:
+                break  # Dropped for being too slow, or the listener is shutting down
+
+            await asyncio.wait_for(response.write(payload), SSE_WRITE_TIMEOUT)
+
+    except (ConnectionResetError, asyncio.TimeoutError):
+        logging.debug("[EVENTS] Subscriber %s went away or stalled", request.remote)
+
+    finally:
+        events.unsubscribe(queue)
+
+    return response
+
+
+async def http_debug_loop_handler(request, profiling):
+    """Handle GET /debug/loop -- event loop implementation and lag statistics."""
+    return aiohttp.web.json_response(profiling['loop_stats'])
+
+
+async def http_debug_pipeline_handler(request, pipeline):
+    """Handle GET /debug/pipeline -- per-stage queue depth, counters and latency."""
+    return aiohttp.web.json_response(pipeline.metrics())
+
+
+async def http_debug_tasks_handler(request):
+    """Handle GET /debug/tasks -- plain-text dump of all live tasks with stacks."""
+    return aiohttp.web.Response(text=format_task_dump())
+
+
+async def http_debug_profile_handler(request, profiling):
+    """Handle POST /debug/profile?seconds=N -- start a sampling profile capture."""
+    try:
+        seconds = int(request.query.get('seconds', PROFILE_DEFAULT_SECONDS))
+    except ValueError:
+        return aiohttp.web.json_response(
+            {'success': False, 'message': '`seconds` must be an integer'}, status=400)
+
+    output_path = start_profile_capture(profiling, seconds)
+    if output_path is None:
+        return aiohttp.web.json_response(
+            {'success': False, 'message': 'A profile capture is already running'}, status=409)
+
+    return aiohttp.web.json_response({'success': True, 'path': output_path}, status=202)
+
+
+async def http_hvac_listener(ntfy_session, account, vehicle_configs, vehicle_states, events,
+                             profiling, pipeline, fence, listen_sockets,
+                             port=HVAC_HTTP_LISTENER_PORT):
+    """
+    Listen for HTTP requests.
+
+    POST /                -- forwarded to http_request_handler() (HVAC start)
+    GET  /vehicles        -- cached state of all vehicles
+    GET  /vehicles/{name} -- cached state of one vehicle
+    GET  /events          -- Server-Sent Events stream of live changes
+    GET  /debug/loop      -- event loop lag statistics
+    GET  /debug/pipeline  -- sample pipeline stage metrics
+    GET  /debug/tasks     -- live task dump
+    POST /debug/profile   -- time-boxed sampling profile capture
+
+    If systemd passed listening sockets ('listen_sockets'), they are used
+    instead of binding localhost:port, so requests arriving while the
+    daemon restarts wait in the kernel's accept queue instead of failing.
+    """
     runner = None
-    site   = None
     try:
         app = aiohttp.web.Application()
         app.router.add_post('/', lambda request: http_request_handler(
-            request, ntfy_session, account, config_dict))
-
-        runner = aiohttp.web.AppRunner(app)
+            request, ntfy_session, account, vehicle_configs, events, fence))
+        app.router.add_get('/vehicles', lambda request: http_vehicles_handler(
+            request, vehicle_states))
+        app.router.add_get('/vehicles/{name}', lambda request: http_vehicle_handler(
+            request, vehicle_configs, vehicle_states))
+        app.router.add_get('/events', lambda request: http_events_handler(request, events))
+        app.router.add_get('/debug/loop', lambda request: http_debug_loop_handler(
+            request, profiling))
+        app.router.add_get('/debug/pipeline', lambda request: http_debug_pipeline_handler(
+            request, pipeline))
+        app.router.add_get('/debug/tasks', http_debug_tasks_handler)
+        app.router.add_post('/debug/profile', lambda request: http_debug_profile_handler(
+            request, profiling))
+
+        async def _close_event_streams(app):
+            events.close()
+
+        # SSE streams never finish on their own -- end them on shutdown
+        app.on_shutdown.append(_close_event_streams)
+
+        runner = aiohttp.web.AppRunner(app, shutdown_timeout=HTTP_SHUTDOWN_TIMEOUT)
         await runner.setup()
 
-        site = aiohttp.web.TCPSite(runner, 'localhost', port)
-        await site.start()
+        if listen_sockets:
+            # Sites close their socket on cleanup -- hand them a duplicate so
+            # the inherited one stays open across main-loop retries
+            for listen_socket in listen_sockets:
+                site = aiohttp.web.SockSite(runner, listen_socket.dup())
+                await site.start()
+                logging.info("HTTP HVAC listener started on inherited socket %s", site.name)
+        else:
+            site = aiohttp.web.TCPSite(runner, 'localhost', port)
+            await site.start()
+            logging.info("HTTP HVAC listener started at http://localhost:%s", port)
 
-        logging.info("HTTP HVAC listener started at http://localhost:%s", port)
         await asyncio.Event().wait()
 
     except asyncio.CancelledError:
         logging.info("HTTP HVAC listener cancelled")
         raise
-        # Always clean up, even if site.start() raised before completing
-        if site is not None:
-            await site.stop()
+
+    finally:
+        # Always clean up (this also stops the sites), even if a site
+        # failed to start, so the next main-loop retry can listen again
         if runner is not None:
             await runner.cleanup()
 
@@ -573,9 +1676,9 @@ async def do_login(client, config_dict):
     """
     Authenticate with Gigya using credentials from the config file.
 
-    With FileCredentialStore, if the stored JWT is still valid the library
-    skips the actual Gigya network call automatically. A round-trip to
-    Gigya only happens when the token is absent or expired.
+    Always a full password login: the stored Gigya keys are cleared and a
+    new login token is written to the FileCredentialStore. Where an
+    existing login only needs to be kept usable, use keep_login_warm().
     """
     await client.session.login(
         config_dict['renault_auth']['email'],
@@ -583,6 +1686,22 @@ async def do_login(client, config_dict):
     )
 
 
+async def keep_login_warm(client, config_dict):
+    """
+    Keep the Renault login usable while on HA standby.
+
+    client.get_person() is a cheap authenticated call, during which the
+    library refreshes the JWT from the stored login token if needed. Only
+    when that login token itself is rejected does this fall back to a full
+    do_login().
+    """
+    try:
+        await client.get_person()
+    except NotAuthenticatedException:
+        logging.info("[HA] Login token expired while standing by -- logging in again")
+        await do_login(client, config_dict)
+
+
 async def main():
     """
     Entry point. Parses arguments, sets up logging, and runs the main loop.
@@ -602,10 +1721,8 @@ async def main():
     them, causing the multi-GB memory growth observed in production.
 
     Login tokens are persisted to CREDENTIAL_STORE_PATH via
-    FileCredentialStore. On a systemd midnight restart, valid tokens are
-    reloaded from disk and the Gigya login round-trip is skipped entirely,
-    reducing startup latency and avoiding unnecessary load on Renault's
-    auth servers.
+    FileCredentialStore, so JWTs are refreshed from the stored login token
+    instead of repeating the Gigya password login on every API call.
 
     Re-login within a running session only occurs when the main loop
     receives NotAuthenticatedException or GigyaException -- not on every
@@ -624,8 +1741,7 @@ async def main():
     port        = HVAC_HTTP_LISTENER_PORT
     debug       = False
 
-    opts, args = getopt.getopt(sys.argv[1:], "hvDc:p:",
-                               ['help', 'version', 'debug', 'config=', 'port='])
+    opts, args = getopt.getopt(sys.argv[1:], GETOPT_SHORT_OPTIONS, GETOPT_LONG_OPTIONS)
     has_arg = {'config_dict': False, 'port': False}
 
     for opt, arg in opts:
@@ -643,6 +1759,7 @@ async def main():
         elif opt in ('-p', '--port'):
             port = int(arg)
             has_arg['port'] = True
+        # -U/--uvloop is handled before the event loop starts, see START
 
     if not has_arg['config_dict']:
         config_dict = await get_config()
@@ -686,7 +1803,7 @@ async def main():
             credential_store=credential_store,
         )
 
-        # Initial login -- may be a no-op if a valid token already exists on disk
+        # Initial login -- a full Gigya password login (see do_login())
         await do_login(client, config_dict)
         logging.info("Logged in to Renault API")
 
@@ -699,53 +1816,170 @@ async def main():
         # --- Signal handling ---
         # tasks is defined here so the signal handler closure can always
         # reference the current list, even as it is replaced each loop iteration.
-        tasks = []
-        loop  = asyncio.get_running_loop()
+        tasks     = []
+        loop      = asyncio.get_running_loop()
+        main_task = asyncio.current_task()
+
+        # Last battery sample per vehicle, shared between the vehicle tasks
+        # and the read-only HTTP API. Kept outside the retry loop so cached
+        # values survive reconnects.
+        vehicle_states = {}
+        events         = EventBroadcaster()
+
+        # Per-vehicle settings in compact form. The raw 'Cars' dicts are
+        # dropped so only one copy of each vehicle's config stays in memory.
+        ntfy_targets    = {}
+        vehicle_configs = {name: VehicleConfig.from_config(name, config_vehicle, ntfy_targets)
+                           for name, config_vehicle in config_dict.pop('Cars').items()}
+
+        # --- Profiling ---
+        profiling_config = config_dict.get('profiling', {})
+        profiling = {
+            'loop_stats': {
+                'loop':          f"{type(loop).__module__}.{type(loop).__name__}",
+                'samples':       0,
+                'last_ms':       0.0,
+                'avg_ms':        0.0,
+                'max_ms':        0.0,
+                'over_warn':     0,
+                'over_critical': 0,
+            },
+            'profile_dir': profiling_config.get('profile_dir', PROFILE_DIR_PATH),
+            'capture':     None,
+        }
+        logging.info("Using event loop `%s'", profiling['loop_stats']['loop'])
+
+        # asyncio debug mode reports every callback slower than the threshold,
+        # but adds overhead to every task switch -- only enable it on request.
+        if profiling_config.get('slow_callback_ms'):
+            loop.set_debug(True)
+            loop.slow_callback_duration = profiling_config['slow_callback_ms'] / 1000
+            logging.info("Reporting asyncio callbacks slower than %s ms",
+                         profiling_config['slow_callback_ms'])
 
         def _signal_handler(sig):
             logging.info("Received signal %s -- cancelling tasks for graceful shutdown", sig.name)
             for task in tasks:
                 task.cancel()
+            # Also interrupt main() itself, which may be waiting outside of
+            # asyncio.gather() (standby, retry sleeps)
+            main_task.cancel()
 
         for sig in (signal.SIGINT, signal.SIGTERM):
             loop.add_signal_handler(sig, _signal_handler, sig)
 
+        # SIGUSR1 dumps all tasks to the log, SIGUSR2 starts a profile capture
+        loop.add_signal_handler(signal.SIGUSR1,
+                                lambda: logging.info("[PROFILING] %s", format_task_dump()))
+        def _profile_signal_handler():
+            try:
+                if start_profile_capture(profiling) is None:
+                    logging.warning("[PROFILING] SIGUSR2 ignored -- a capture is already running")
+            except OSError as e:
+                logging.error("[PROFILING] Could not start a capture: %s", e)
+
+        loop.add_signal_handler(signal.SIGUSR2, _profile_signal_handler)
+
+        # --- systemd integration ---
+        listen_sockets = sd_listen_fds()
+        if listen_sockets:
+            logging.info("Using %d listening socket(s) passed by systemd", len(listen_sockets))
+
+        # The lag monitor and the watchdog must keep running during main-loop
+        # retry waits and HA standby (the watchdog pings based on the lag
+        # monitor's figures), so they run for the whole process instead of
+        # being part of 'tasks'
+        lag_monitor_task = asyncio.create_task(monitor_loop_lag(
+            profiling['loop_stats'],
+            profiling_config.get('loop_lag_warn_ms', LOOP_LAG_WARN_MS),
+            profiling_config.get('loop_lag_critical_ms', LOOP_LAG_CRITICAL_MS)))
+
+        watchdog_task     = None
+        watchdog_interval = sd_watchdog_interval()
+        if watchdog_interval is not None:
+            logging.info("systemd watchdog enabled, pinging every %.1fs", watchdog_interval)
+            watchdog_task = asyncio.create_task(systemd_watchdog(
+                profiling['loop_stats'], watchdog_interval,
+                profiling_config.get('loop_lag_critical_ms', LOOP_LAG_CRITICAL_MS)))
+        ready_task = None
+
+        # --- Active/standby high availability ---
+        # Only the instance holding the lease polls vehicles, serves HTTP and
+        # acts; the others stay logged in and wait to take over.
+        ha_config = config_dict.get('high_availability', {})
+        lease     = None
+        fence     = LeaseFence()  # Never closes without high availability
+        if ha_config.get('enabled'):
+            lease      = LEASE_BACKENDS[ha_config.get('backend', 'file')](ha_config['path'])
+            lease_ttl  = ha_config.get('lease_ttl', LEASE_TTL)
+            ha_holder  = f"{socket.gethostname()}:{os.getpid()}"
+            fence      = LeaseFence(lease_ttl)
+            logging.info("[HA] Leader election enabled (`%s' backend, %ss lease)",
+                         ha_config.get('backend', 'file'), lease_ttl)
+
+        # Consumer stages for the battery samples polled by the vehicle
+        # tasks; only its workers are restarted on every retry, so the
+        # GET /debug/pipeline counters survive reconnects too
+        pipeline = SamplePipeline(ntfy_session, vehicle_states, events, fence)
+
         # --- Main retry loop ---
         try:
             while True:
                 tasks = []
                 try:
+                    if lease is not None:
+                        await wait_for_leadership(lease, ha_holder, lease_ttl,
+                                                  keep_warm=lambda: keep_login_warm(client, config_dict),
+                                                  fence=fence)
+                        # Standby set STATUS=Standby, and systemd_notify_ready()
+                        # only runs once per process -- report the takeover here
+                        sd_notify(f"STATUS=Leader, monitoring {len(vehicle_configs)} vehicles")
+                        tasks.append(asyncio.create_task(
+                            hold_lease(lease, ha_holder, lease_ttl, fence)))
+
                     vehicles = await account.get_vehicles()
 
                     if str(vehicles.errors) != 'None':
                         logging.warning("Got vehicle errors: %s -- retrying in %ds",
                                         vehicles.errors, WAIT_TRANSIENT)
+                        await cancel_tasks(tasks)
                         await asyncio.sleep(WAIT_TRANSIENT)
                         continue
 
                     # Validate VINs from config against those on the Renault account
                     renault_vins = [link['vin'] for link in vehicles.raw_data['vehicleLinks']]
                     invalid_vin = False
-                    for vehicle_name in config_dict['Cars']:
-                        if config_dict['Cars'][vehicle_name]['VIN'] not in renault_vins:
+                    for vehicle_config in vehicle_configs.values():
+                        if vehicle_config.vin not in renault_vins:
                             logging.error("[main] `%s` is missing in the Renault/Dacia account!",
-                                          config_dict['Cars'][vehicle_name]['VIN'])
+                                          vehicle_config.vin)
                             invalid_vin = True
                     if invalid_vin:
                         sys.exit(1)
 
-                    # One asyncio task per vehicle
-                    for vehicle_entry in config_dict['Cars']:
+                    # Consumer stages for the battery samples polled below
+                    tasks.extend(pipeline.start())
+
+                    # One asyncio polling task per vehicle
+                    for vehicle_config in vehicle_configs.values():
                         tasks.append(asyncio.create_task(
-                            create_vehicle(ntfy_session, account,
-                                           config_dict['Cars'][vehicle_entry], vehicle_entry)
+                            create_vehicle(account, vehicle_config, pipeline, fence)
                         ))
 
                     # One task for the HTTP HVAC listener
                     tasks.append(asyncio.create_task(
-                        http_hvac_listener(ntfy_session, account, config_dict, port)
+                        http_hvac_listener(ntfy_session, account, vehicle_configs,
+                                           vehicle_states, events, profiling, pipeline,
+                                           fence, listen_sockets, port)
                     ))
 
+                    # Tell systemd we're up once the first poll is done (only once
+                    # per process, a reconnect doesn't make us "not ready" again)
+                    if ready_task is None or ready_task.cancelled():
+                        ready_task = asyncio.create_task(
+                            systemd_notify_ready(vehicle_configs, vehicle_states))
+                        tasks.append(ready_task)
+
                     await asyncio.gather(*tasks)
 
                 # --- Signal-driven cancellation: exit the retry loop cleanly ---
@@ -801,6 +2035,13 @@ async def main():
                         logging.error("Re-login attempt failed: %s -- will retry next cycle", login_err)
                     continue
 
+                # --- Leadership lost: stop acting at once and go back to standby ---
+                except LeaseLostError as e:
+                    logging.warning("[HA] No longer the leader (%s) -- standing by", e)
+                    fence.revoke()
+                    await cancel_tasks(tasks)
+                    continue
+
                 # --- Unexpected / fatal errors: notify admin and shut down ---
                 except Exception as e:
                     logging.error("[SERVER SHUTDOWN] Unexpected error: %s", e)
@@ -821,9 +2062,40 @@ async def main():
                     sys.exit(1)
 
         except asyncio.CancelledError:
+            sd_notify("STOPPING=1")
+            if lease is not None:
+                # Let the standby take over right away instead of after the TTL
+                await asyncio.to_thread(lease.release, ha_holder)
+            await cancel_tasks([task for task in (watchdog_task, lag_monitor_task)
+                                if task is not None])
             logging.info("Shutdown complete")
 
 
 ### START ###
+def get_event_loop_runner():
+    """
+    Return uvloop.run if -U/--uvloop was given and uvloop is installed,
+    asyncio.run otherwise.
+
+    This has to be decided before main() runs, since the event loop
+    implementation can't be swapped once the loop is running.
+    """
+    try:
+        opts, args = getopt.getopt(sys.argv[1:], GETOPT_SHORT_OPTIONS, GETOPT_LONG_OPTIONS)
+    except getopt.GetoptError:
+        return asyncio.run  # Let main() report the bad option
+
+    if not any(opt in ('-U', '--uvloop') for opt, arg in opts):
+        return asyncio.run
+
+    try:
+        import uvloop
+    except ImportError:
+        print("uvloop is not installed -- falling back to the default asyncio event loop",
+              file=sys.stderr)
+        return asyncio.run
+    return uvloop.run
+
+
 if __name__ == "__main__":
-    asyncio.run(main())
+    get_event_loop_runner()(main())
@@ -0,0 +1,230 @@
+#!python3
+
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# Copyright (C) 2024 TheRealOne78 <bajcsielias78@gmail.com>
+# This file is part of the Zegra-server project
+
+"""
+Measure active/standby failover time and duplicate actions.
+
+Starts a local stand-in upstream (an HTTP server counting actions) and two
+instances that run the leader election of main.py (wait_for_leadership(),
+hold_lease() and LeaseFence) against a shared lease. Whoever is leader
+sends one action per polling slot to the upstream, like create_vehicle()
+would send charging_start / hvac_start, checking the fence first.
+
+The leader is then killed with SIGKILL (crash: the standby must wait for
+the lease to expire) and, after a new standby joins, frozen with SIGSTOP
+for twice the TTL and resumed with SIGCONT (pause: the resumed instance
+must not act on its expired lease), and finally the leader is stopped
+with SIGTERM (clean shutdown: the lease is released). For each takeover
+the gap between the last action of the old leader and the first action of
+the new one is reported, as well as the number of actions sent while
+another instance was also acting, which should always be 0.
+
+Usage: python3 tools/bench_failover.py [--backend file|sqlite] [--ttl SECONDS] [--poll SECONDS]
+"""
+
+import asyncio
+import getopt
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+
+import aiohttp
+import aiohttp.web
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from main import (  # noqa: E402
+    LEASE_BACKENDS,
+    LeaseFence,
+    LeaseLostError,
+    cancel_tasks,
+    hold_lease,
+    wait_for_leadership,
+)
+
+
+async def run_instance(holder, backend, path, ttl, poll, upstream):
+    """One contender: stand by, then act once per slot while leader."""
+    lease = LEASE_BACKENDS[backend](path)
+    fence = LeaseFence(ttl)
+    loop  = asyncio.get_running_loop()
+    loop.add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+
+    async with aiohttp.ClientSession() as session:
+        # Tell the bench we're up and about to contend for the lease
+        async with session.post(upstream.replace('/action', '/ready'), json={'holder': holder}):
+            pass
+        try:
+            while True:
+                await wait_for_leadership(lease, holder, ttl, fence=fence)
+                keeper = asyncio.create_task(hold_lease(lease, holder, ttl, fence))
+                try:
+                    while not keeper.done():
+                        fence.check()
+                        slot = int(time.time() / poll)
+                        async with session.post(upstream, json={'holder': holder, 'slot': slot}):
+                            pass
+                        await asyncio.wait([keeper], timeout=(slot + 1) * poll - time.time())
+                    keeper.result()
+                except LeaseLostError:
+                    fence.revoke()
+                    continue
+                finally:
+                    await cancel_tasks([keeper])
+        except asyncio.CancelledError:
+            await asyncio.to_thread(lease.release, holder)
+
+
+def spawn(holder, backend, path, ttl, poll, upstream):
+    """Start a contender in its own process, as a separate daemon would be."""
+    return subprocess.Popen([sys.executable, os.path.abspath(__file__), '--instance', holder,
+                             '--backend', backend, '--path', path, '--ttl', str(ttl),
+                             '--poll', str(poll), '--upstream', upstream])
+
+
+async def wait_until(condition, timeout, what):
+    """Poll 'condition' until it returns something truthy, or exit after 'timeout'."""
+    deadline = time.monotonic() + timeout
+    while not (result := condition()):
+        if time.monotonic() >= deadline:
+            sys.exit(f"timed out after {timeout:.0f}s waiting for {what}")
+        await asyncio.sleep(0.05)
+    return result
+
+
+async def takeover(actions, old_holder, stop_time, timeout):
+    """Wait for another holder to act after 'stop_time' and return the gap."""
+    first_at, new_holder = await wait_until(
+        lambda: next(((at, holder) for at, holder, _ in actions
+                      if at > stop_time and holder != old_holder), None),
+        timeout, f"a takeover from {old_holder}")
+    last_old = max((at for at, holder, _ in actions if holder == old_holder and at < first_at),
+                   default=stop_time)
+    return new_holder, first_at - last_old
+
+
+async def bench(backend, ttl, poll, startup_timeout=30):
+    actions = []     # (time, holder, slot) as seen by the stand-in upstream
+    ready   = set()  # instances that started up and contend for the lease
+
+    async def upstream_handler(request):
+        data = await request.json()
+        actions.append((time.time(), data['holder'], data['slot']))
+        return aiohttp.web.json_response({'success': True})
+
+    async def ready_handler(request):
+        ready.add((await request.json())['holder'])
+        return aiohttp.web.json_response({'success': True})
+
+    app = aiohttp.web.Application()
+    app.router.add_post('/action', upstream_handler)
+    app.router.add_post('/ready', ready_handler)
+    runner = aiohttp.web.AppRunner(app)
+    await runner.setup()
+    site = aiohttp.web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    upstream = f"http://127.0.0.1:{runner.addresses[0][1]}/action"
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path      = os.path.join(tmp_dir, 'lease')
+        instances = {name: spawn(name, backend, path, ttl, poll, upstream) for name in ('A', 'B')}
+        try:
+            # Importing main.py alone takes most of a second -- wait for
+            # both instances instead of guessing how long start-up takes
+            await wait_until(lambda: ready >= {'A', 'B'}, startup_timeout, "A and B to start")
+            await wait_until(lambda: actions, startup_timeout + ttl, "the first action")
+            await asyncio.sleep(2 * poll)
+            leader = actions[-1][1]
+
+            # Crash: the standby has to wait for the lease to expire
+            instances[leader].send_signal(signal.SIGKILL)
+            killed_at = time.time()
+            new_leader, gap = await takeover(actions, leader, killed_at, 3 * ttl)
+            print(f"crash (SIGKILL):  {leader} -> {new_leader} in {gap:.2f}s "
+                  f"(lease TTL {ttl}s)")
+
+            instances['C'] = spawn('C', backend, path, ttl, poll, upstream)
+            await wait_until(lambda: 'C' in ready, startup_timeout, "C to start")
+            await asyncio.sleep(2 * poll)
+
+            # Pause: the leader is frozen past its lease and then resumes
+            leader = new_leader
+            instances[leader].send_signal(signal.SIGSTOP)
+            paused_at = time.time()
+            new_leader, gap = await takeover(actions, leader, paused_at, 3 * ttl)
+            await asyncio.sleep(max(0, paused_at + 2 * ttl - time.time()))
+            instances[leader].send_signal(signal.SIGCONT)
+            print(f"pause (SIGSTOP):  {leader} -> {new_leader} in {gap:.2f}s "
+                  f"(resumed after {2 * ttl:.0f}s)")
+            await asyncio.sleep(max(4 * poll, 1))
+
+            # Clean shutdown: the lease is released right away
+            leader = new_leader
+            instances[leader].send_signal(signal.SIGTERM)
+            stopped_at = time.time()
+            new_leader, gap = await takeover(actions, leader, stopped_at, 3 * ttl)
+            print(f"clean (SIGTERM):  {leader} -> {new_leader} in {gap:.2f}s")
+
+            await asyncio.sleep(max(2 * poll, 1))
+        finally:
+            for instance in instances.values():
+                instance.kill()
+                instance.wait()
+            await runner.cleanup()
+
+    # Split each holder's actions into leadership terms (a leader acts every
+    # slot, so a longer silence ends a term -- e.g. while it was paused). An
+    # action is a duplicate if it was sent inside another holder's term.
+    terms = []  # [holder, first, last]
+    open_terms = {}
+    for at, holder, _ in sorted(actions):
+        term = open_terms.get(holder)
+        if term is None or at - term[2] > 3 * poll:
+            term = open_terms[holder] = [holder, at, at]
+            terms.append(term)
+        term[2] = at
+    duplicates = sum(any(first <= at <= last for other, first, last in terms if other != holder)
+                     for at, holder, _ in actions)
+    print(f"{len(actions)} actions in {len(terms)} leadership terms, {duplicates} duplicate actions")
+
+
+def main():
+    opts, args = getopt.getopt(sys.argv[1:], "h",
+                               ['help', 'backend=', 'ttl=', 'poll=',
+                                'instance=', 'path=', 'upstream='])
+    backend  = 'file'
+    ttl      = 3.0
+    poll     = 0.25
+    instance = path = upstream = None
+
+    for opt, arg in opts:
+        if opt in ('-h', '--help'):
+            print(__doc__)
+            sys.exit(0)
+        elif opt == '--backend':
+            backend = arg
+        elif opt == '--ttl':
+            ttl = float(arg)
+        elif opt == '--poll':
+            poll = float(arg)
+        elif opt == '--instance':
+            instance = arg
+        elif opt == '--path':
+            path = arg
+        elif opt == '--upstream':
+            upstream = arg
+
+    if instance is not None:
+        asyncio.run(run_instance(instance, backend, path, ttl, poll, upstream))
+    else:
+        asyncio.run(bench(backend, ttl, poll))
+
+
+if __name__ == "__main__":
+    main()
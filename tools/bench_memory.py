@@ -0,0 +1,119 @@
+#!python3
+
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# Copyright (C) 2024 TheRealOne78 <bajcsielias78@gmail.com>
+# This file is part of the Zegra-server project
+
+"""
+Memory footprint of the per-vehicle state, in bytes per monitored vehicle.
+
+Compares the original representation (the raw 'Cars' config dict kept for
+the whole process, a nested status_checkers dict and a dict per cached
+sample) with VehicleConfig / VehicleState / VehicleSample from main.py.
+The fleet config is parsed from JSON text, like the real config file, so
+identical strings in different vehicles are separate objects.
+
+Usage: python3 tools/bench_memory.py [fleet_size ...]
+"""
+
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from main import VehicleConfig, VehicleState, VehicleSample  # noqa: E402
+
+DEFAULT_FLEET_SIZES = (10, 1000, 10000)
+
+
+def fleet_config_json(fleet_size):
+    """Return the JSON text of a 'Cars' section with 'fleet_size' vehicles."""
+    return json.dumps({
+        f"Car {index:05d}": {
+            'account_type':            'MYRENAULT',
+            'VIN':                     f"VF1AG000{index:09d}",
+            'warn_battery_percentage': 30,
+            'min_battery_percentage':  15,
+            'max_battery_temperature': 45,
+            'check_time':              10,
+            'max_tries':               3,
+            'NTFY_topic':              'https://ntfy.example.com/fleet',
+            'NTFY_auth': {
+                'username': 'fleet',
+                'password': 'secret',
+            },
+        }
+        for index in range(fleet_size)
+    })
+
+
+def build_dict_fleet(cars_json):
+    """Per-vehicle state as originally kept by main() and create_vehicle()."""
+    cars   = json.loads(cars_json)
+    now    = time.time()
+    fleet  = []
+    for nickname, config_vehicle in cars.items():
+        status_checkers = {
+            'battery_percentage_checked': [],
+            'charge_dict': {
+                'count':    0,
+                'hvac':     False,
+                'notified': False,
+            },
+            'battery_temp_notified':    False,
+            'battery_charged_notified': False,
+        }
+        sample = {
+            'battery_percentage':  80,
+            'battery_plugged':     True,
+            'battery_temperature': 21.0,
+            'battery_charging':    False,
+            'timestamp':           now,
+            'etag':                '%x' % int(now * 1000),
+        }
+        fleet.append((nickname, config_vehicle, status_checkers, sample))
+    return fleet
+
+
+def build_slotted_fleet(cars_json):
+    """Per-vehicle state as kept by main() and create_vehicle() now."""
+    ntfy_targets = {}
+    now          = time.time()
+    fleet        = []
+    for nickname, config_vehicle in json.loads(cars_json).items():
+        fleet.append((VehicleConfig.from_config(nickname, config_vehicle, ntfy_targets),
+                      VehicleState(),
+                      VehicleSample(80, True, 21.0, False, now)))
+    return fleet
+
+
+def measure(builder, cars_json):
+    """Return the bytes still allocated by builder() once it has returned."""
+    gc.collect()
+    tracemalloc.start()
+    fleet = builder(cars_json)
+    gc.collect()
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del fleet
+    return allocated
+
+
+def main():
+    fleet_sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_FLEET_SIZES
+
+    print(f"{'vehicles':>10}  {'dict B/veh':>12}  {'slots B/veh':>12}  {'saved':>7}")
+    for fleet_size in fleet_sizes:
+        cars_json   = fleet_config_json(fleet_size)
+        dict_size   = measure(build_dict_fleet, cars_json) / fleet_size
+        slots_size  = measure(build_slotted_fleet, cars_json) / fleet_size
+        print(f"{fleet_size:>10}  {dict_size:>12.0f}  {slots_size:>12.0f}  "
+              f"{1 - slots_size / dict_size:>7.1%}")
+
+
+if __name__ == "__main__":
+    main()
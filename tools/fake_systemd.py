@@ -0,0 +1,134 @@
+#!python3
+
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# Copyright (C) 2024 TheRealOne78 <bajcsielias78@gmail.com>
+# This file is part of the Zegra-server project
+
+"""
+Minimal stand-in for systemd to try socket activation, readiness and the
+watchdog locally.
+
+Binds the HVAC listening socket itself and passes it to the child as
+file descriptor 3 (LISTEN_FDS / LISTEN_PID), provides a NOTIFY_SOCKET and
+WATCHDOG_USEC, and prints every notification it receives together with the
+time since the child was started. With --restart the child is started
+again whenever it exits -- or misses a watchdog deadline -- reusing the
+same listening socket, so HVAC requests sent meanwhile are queued by the
+kernel instead of refused.
+
+Usage: python3 tools/fake_systemd.py [options] -- main.py [main.py options]
+"""
+
+import getopt
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+SD_LISTEN_FDS_START = 3
+
+
+def print_help():
+    """Print a help message."""
+    print('Usage: %s [options] -- command [args ...]\n'
+          '\n'
+          'Options:\n'
+          '-h, --help        Output this help list and exit\n'
+          '-p, --port        Port of the passed listening socket (default 47591)\n'
+          '-w, --watchdog    Watchdog timeout in seconds, 0 to disable (default 10)\n'
+          '-r, --restart     Restart the command when it exits or misses the watchdog'
+          % sys.argv[0])
+
+
+def spawn(command, listen_socket, notify_path, watchdog):
+    """Start 'command' the way systemd would for a Type=notify socket service."""
+    env = dict(os.environ, NOTIFY_SOCKET=notify_path, LISTEN_FDS='1')
+    if watchdog:
+        env['WATCHDOG_USEC'] = str(int(watchdog * 1e6))
+
+    def _child_setup():
+        # LISTEN_PID must be the PID of the exec'd process, i.e. the child's own
+        os.environ['LISTEN_PID'] = str(os.getpid())
+        os.dup2(listen_socket.fileno(), SD_LISTEN_FDS_START)
+
+    # env is applied through os.environ in the child, so LISTEN_PID can be added
+    os.environ.update(env)
+    try:
+        return subprocess.Popen(command, preexec_fn=_child_setup,
+                                pass_fds=(SD_LISTEN_FDS_START,))
+    finally:
+        for name in ('NOTIFY_SOCKET', 'LISTEN_FDS', 'WATCHDOG_USEC'):
+            os.environ.pop(name, None)
+
+
+def main():
+    opts, command = getopt.getopt(sys.argv[1:], "hp:w:r", ['help', 'port=', 'watchdog=', 'restart'])
+
+    port     = 47591
+    watchdog = 10.0
+    restart  = False
+
+    for opt, arg in opts:
+        if opt in ('-h', '--help'):
+            print_help()
+            sys.exit(0)
+        elif opt in ('-p', '--port'):
+            port = int(arg)
+        elif opt in ('-w', '--watchdog'):
+            watchdog = float(arg)
+        elif opt in ('-r', '--restart'):
+            restart = True
+
+    if not command:
+        print_help()
+        sys.exit(1)
+
+    listen_socket = socket.create_server(('127.0.0.1', port))
+    # Make sure fd 3 is not something we still need before the child dup2()s over it
+    if listen_socket.fileno() != SD_LISTEN_FDS_START:
+        os.dup2(listen_socket.fileno(), SD_LISTEN_FDS_START)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        notify_path   = os.path.join(tmp_dir, 'notify')
+        notify_socket = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        notify_socket.bind(notify_path)
+        notify_socket.settimeout(0.5)
+
+        print(f"[fake-systemd] listening on 127.0.0.1:{port}, notify socket {notify_path}")
+        try:
+            while True:
+                child         = spawn(command, listen_socket, notify_path, watchdog)
+                started       = time.monotonic()
+                last_watchdog = started
+                print(f"[fake-systemd] started PID {child.pid}")
+
+                while child.poll() is None:
+                    try:
+                        message = notify_socket.recv(4096).decode()
+                        now     = time.monotonic()
+                        print(f"[fake-systemd] +{now - started:8.3f}s "
+                              f"{message.replace(chr(10), ' | ')}")
+                        if 'WATCHDOG=1' in message.split('\n'):
+                            last_watchdog = now
+                    except socket.timeout:
+                        pass
+
+                    if watchdog and time.monotonic() - last_watchdog > watchdog:
+                        print(f"[fake-systemd] watchdog timeout ({watchdog}s) -- killing PID {child.pid}")
+                        child.kill()
+                        child.wait()
+
+                print(f"[fake-systemd] PID {child.pid} exited with {child.returncode} "
+                      f"after {time.monotonic() - started:.3f}s")
+                if not restart:
+                    break
+
+        except KeyboardInterrupt:
+            child.terminate()
+            child.wait()
+
+
+if __name__ == "__main__":
+    main()
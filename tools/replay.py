@@ -0,0 +1,258 @@
+#!python3
+
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# Copyright (C) 2024 TheRealOne78 <bajcsielias78@gmail.com>
+# This file is part of the Zegra-server project
+
+"""
+Replay battery traces through the alerting / charging decision logic.
+
+Feeds recorded or synthetic samples through main.evaluate_battery_sample()
+at full speed, without a car, the Renault API or NTFY, and writes the
+actions that would have fired as JSON lines. A summary with the decision
+throughput is printed to stderr.
+
+Trace records (JSONL objects or CSV rows with a header line):
+
+  vehicle              -- nickname, matched against the config's 'Cars'
+  battery_percentage   -- 0-100
+  battery_plugged      -- 0/1 or true/false
+  battery_temperature  -- degrees, may be empty
+  battery_charging     -- 0/1 or true/false
+  timestamp            -- optional, copied to the output
+
+Samples with an empty percentage, plug or charging value are skipped, the
+same way create_vehicle() skips them.
+"""
+
+import csv
+import getopt
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from main import (  # noqa: E402
+    VehicleConfig,
+    VehicleState,
+    evaluate_battery_sample,
+)
+
+# Thresholds for vehicles missing from the config file (or without one)
+DEFAULT_VEHICLE_CONFIG = {
+    'VIN':                     '',
+    'warn_battery_percentage': 30,
+    'min_battery_percentage':  15,
+    'max_battery_temperature': 45,
+    'check_time':              10,
+    'max_tries':               3,
+    'NTFY_topic':              '',
+    'NTFY_auth':               {'username': '', 'password': ''},
+}
+
+
+def print_help():
+    """Print a help message."""
+    print('Usage: %s [options] [trace.jsonl|trace.csv ...]\n'
+          '\n'
+          'Options:\n'
+          '-h, --help            Output this help list and exit\n'
+          '-c, --config          Take per-vehicle thresholds from this config file\n'
+          '-o, --output          Write actions to this file instead of stdout\n'
+          '-q, --quiet           Do not output actions, only the summary\n'
+          '-s, --synthetic N:M   Replay N synthetic vehicles with M samples each\n'
+          '    --seed            Random seed for --synthetic (default 0)\n'
+          '    --warn, --min, --max-temp, --max-tries\n'
+          '                      Override the default thresholds'
+          % sys.argv[0])
+
+
+def parse_bool(value):
+    """Parse a JSON / CSV boolean-ish value, keeping None for empty fields."""
+    if value is None or value == '':
+        return None
+    if isinstance(value, str):
+        return value.strip().lower() in ('1', 'true', 'yes', 'on')
+    return bool(value)
+
+
+def parse_number(value):
+    """Parse a JSON / CSV number, keeping None for empty fields."""
+    if value is None or value == '':
+        return None
+    if isinstance(value, str):
+        value = float(value)
+        return int(value) if value.is_integer() else value
+    return value
+
+
+def read_trace(path):
+    """Yield the raw records of a JSONL or CSV trace file."""
+    with open(path, 'r', encoding='utf-8', newline='') as trace_file:
+        if path.endswith('.csv'):
+            yield from csv.DictReader(trace_file)
+        else:
+            for line in trace_file:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def synthetic_trace(vehicle_count, sample_count, seed=0):
+    """
+    Yield random but plausible samples for 'vehicle_count' vehicles.
+
+    Each vehicle drives its battery down, gets plugged in below a random
+    level and charges back up; some chargers randomly refuse to start and
+    some batteries run hot, so every rule gets exercised.
+    """
+    rng = random.Random(seed)
+    vehicles = [{'vehicle': f"Car {index:05d}",
+                 'level':   rng.uniform(20, 100),
+                 'plugged': False,
+                 'temp':    rng.uniform(10, 30)}
+                for index in range(vehicle_count)]
+
+    for step in range(sample_count):
+        for vehicle in vehicles:
+            if vehicle['plugged']:
+                charging = rng.random() > 0.1
+                vehicle['level'] = min(100.0, vehicle['level'] + (8 if charging else 0))
+                if vehicle['level'] >= 100 and rng.random() < 0.3:
+                    vehicle['plugged'] = False
+            else:
+                charging = False
+                vehicle['level'] = max(0.0, vehicle['level'] - rng.uniform(0, 6))
+                if vehicle['level'] < rng.uniform(5, 40):
+                    vehicle['plugged'] = True
+            vehicle['temp'] = min(60.0, max(-10.0, vehicle['temp'] + rng.uniform(-3, 3.2)))
+
+            yield {'vehicle':             vehicle['vehicle'],
+                   'timestamp':           step,
+                   'battery_percentage':  round(vehicle['level']),
+                   'battery_plugged':     vehicle['plugged'],
+                   'battery_temperature': round(vehicle['temp'], 1),
+                   'battery_charging':    charging}
+
+
+def replay(records, vehicle_configs, default_config, output):
+    """
+    Run 'records' through evaluate_battery_sample(), one state per vehicle.
+
+    Writes one JSON line per action to 'output' (unless it is None) and
+    returns (samples, skipped, actions, vehicles).
+    """
+    ntfy_targets = {}
+    states       = {}
+    samples = skipped = action_count = 0
+
+    for record in records:
+        vehicle_nickname     = record['vehicle']
+        battery_percentage   = parse_number(record.get('battery_percentage'))
+        battery_plugged      = parse_bool(record.get('battery_plugged'))
+        battery_temperature  = parse_number(record.get('battery_temperature'))
+        battery_charging     = parse_bool(record.get('battery_charging'))
+
+        if battery_percentage is None or battery_plugged is None or battery_charging is None:
+            skipped += 1
+            continue
+
+        if vehicle_nickname not in states:
+            if vehicle_nickname not in vehicle_configs:
+                vehicle_configs[vehicle_nickname] = VehicleConfig.from_config(
+                    vehicle_nickname, default_config, ntfy_targets)
+            states[vehicle_nickname] = VehicleState()
+
+        actions = evaluate_battery_sample(vehicle_configs[vehicle_nickname],
+                                          states[vehicle_nickname],
+                                          battery_percentage, battery_plugged,
+                                          battery_temperature, not battery_charging)
+        samples      += 1
+        action_count += len(actions)
+
+        if output is not None:
+            for action in actions:
+                output.write(json.dumps({'timestamp': record.get('timestamp'),
+                                         'vehicle':   vehicle_nickname,
+                                         'action':    action[0],
+                                         'args':      action[1:]}) + '\n')
+
+    return samples, skipped, action_count, len(states)
+
+
+def main():
+    opts, args = getopt.getopt(sys.argv[1:], "hc:o:qs:",
+                               ['help', 'config=', 'output=', 'quiet', 'synthetic=', 'seed=',
+                                'warn=', 'min=', 'max-temp=', 'max-tries='])
+
+    default_config = dict(DEFAULT_VEHICLE_CONFIG)
+    vehicle_configs = {}
+    output_path     = None
+    quiet           = False
+    synthetic       = None
+    seed            = 0
+
+    for opt, arg in opts:
+        if opt in ('-h', '--help'):
+            print_help()
+            sys.exit(0)
+        elif opt in ('-c', '--config'):
+            with open(arg, 'r', encoding='utf8') as json_file:
+                cars = json.load(json_file)['Cars']
+            ntfy_targets    = {}
+            vehicle_configs = {name: VehicleConfig.from_config(name, config_vehicle, ntfy_targets)
+                               for name, config_vehicle in cars.items()}
+        elif opt in ('-o', '--output'):
+            output_path = arg
+        elif opt in ('-q', '--quiet'):
+            quiet = True
+        elif opt in ('-s', '--synthetic'):
+            vehicle_count, sample_count = arg.split(':')
+            synthetic = (int(vehicle_count), int(sample_count))
+        elif opt == '--seed':
+            seed = int(arg)
+        elif opt == '--warn':
+            default_config['warn_battery_percentage'] = float(arg)
+        elif opt == '--min':
+            default_config['min_battery_percentage'] = float(arg)
+        elif opt == '--max-temp':
+            default_config['max_battery_temperature'] = float(arg)
+        elif opt == '--max-tries':
+            default_config['max_tries'] = int(arg)
+
+    if synthetic is None and not args:
+        print_help()
+        sys.exit(1)
+
+    def records():
+        if synthetic is not None:
+            yield from synthetic_trace(*synthetic, seed=seed)
+        for path in args:
+            yield from read_trace(path)
+
+    if quiet:
+        output = None
+    elif output_path is not None:
+        output = open(output_path, 'w', encoding='utf-8')
+    else:
+        output = sys.stdout
+
+    start = time.perf_counter()
+    try:
+        samples, skipped, action_count, vehicle_count = replay(
+            records(), vehicle_configs, default_config, output)
+    finally:
+        if output not in (None, sys.stdout):
+            output.close()
+    elapsed = time.perf_counter() - start
+
+    print(f"{samples} samples ({skipped} skipped) from {vehicle_count} vehicles -> "
+          f"{action_count} actions in {elapsed:.3f}s "
+          f"({samples / elapsed if elapsed else 0:,.0f} samples/s)",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()